@@ -0,0 +1,295 @@
+import asyncio
+import heapq
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+class AgentNode:
+
+    __slots__ = ("name", "fn", "inputs", "outputs", "blocking", "async_fn", "timed")
+
+    def __init__(self, name, fn, inputs, outputs, blocking=False, async_fn=None, timed=True):
+
+        # fn takes the values named by inputs and returns one value per
+        # output (a tuple when there are several). Blocking nodes run off
+        # the calling thread; async_fn is their coroutine variant.
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.blocking = blocking
+        self.async_fn = async_fn
+        self.timed = timed
+
+
+class AgentGraph:
+
+    def __init__(self, nodes, inputs=("request",), metrics=None):
+
+        self.nodes = list(nodes)
+        self.inputs = set(inputs)
+        self.metrics = metrics
+
+        self.producer = {}
+        for node in self.nodes:
+            for key in node.outputs:
+                if key in self.producer or key in self.inputs:
+                    raise ValueError(f"'{key}' is produced more than once")
+                self.producer[key] = node
+
+        self.dependencies = {}
+        self.consumers = {node: [] for node in self.nodes}
+
+        for node in self.nodes:
+
+            missing = [key for key in node.inputs if key not in self.producer and key not in self.inputs]
+            if missing:
+                raise ValueError(f"{node.name} needs {missing}, which nothing produces")
+
+            upstream = {self.producer[key] for key in node.inputs if key in self.producer}
+            self.dependencies[node] = upstream
+
+            for producer in upstream:
+                self.consumers[producer].append(node)
+
+        self._plans = {}
+
+        # Plans for every output double as the cycle check
+        self.plan(None)
+
+    def plan(self, targets):
+
+        # Nodes needed for the target outputs, their unmet dependency
+        # counts, downstream nodes within the plan and a run order.
+        # Cached per target tuple.
+        plan = self._plans.get(targets)
+
+        if plan is not None:
+            return plan
+
+        if targets is None:
+            needed = set(self.nodes)
+        else:
+            needed = set()
+            stack = [self.producer[target] for target in targets if target in self.producer]
+            while stack:
+                node = stack.pop()
+                if node not in needed:
+                    needed.add(node)
+                    stack.extend(self.dependencies[node])
+
+        position = {node: i for i, node in enumerate(self.nodes)}
+        remaining = {node: len(self.dependencies[node]) for node in needed}
+        consumers = {
+            node: [consumer for consumer in self.consumers[node] if consumer in needed]
+            for node in needed
+        }
+
+        # Whatever feeds a blocking node runs first so the slow call starts
+        # as early as possible; otherwise keep declaration order.
+        feeds_blocking = set()
+        stack = [node for node in needed if node.blocking]
+        while stack:
+            for upstream in self.dependencies[stack.pop()]:
+                if upstream not in feeds_blocking:
+                    feeds_blocking.add(upstream)
+                    stack.append(upstream)
+
+        def rank(node):
+            return (node not in feeds_blocking, position[node])
+
+        order = []
+        counts = dict(remaining)
+        heap = [rank(node) for node in needed if not counts[node]]
+        heapq.heapify(heap)
+
+        while heap:
+            node = self.nodes[heapq.heappop(heap)[1]]
+            order.append(node)
+            for consumer in consumers[node]:
+                counts[consumer] -= 1
+                if not counts[consumer]:
+                    heapq.heappush(heap, rank(consumer))
+
+        if len(order) != len(needed):
+            raise ValueError("agent graph has a cycle")
+
+        plan = self._plans[targets] = (remaining, consumers, order)
+
+        return plan
+
+    def required(self, targets):
+
+        # Every value computed on the way to the targets
+        return {key for node in self.plan(targets)[0] for key in node.outputs}
+
+    def run(self, values, targets=None, executor=None, deadline=None):
+
+        # Blocking nodes go to the executor as soon as their inputs exist;
+        # everything else runs inline while they are in flight, so the
+        # slowest chain sets the latency rather than the sum of nodes.
+        # At the deadline (a time.monotonic() value) nodes still in flight
+        # are abandoned along with everything downstream of them; the
+        # returned values then lack their outputs.
+        remaining, consumers, order = self.plan(targets)
+        values = dict(values)
+        remaining = dict(remaining)
+        running = {}
+        started = set()
+
+        def finish(node, result):
+            for consumer in self._store(node, result, values, consumers, remaining):
+                if consumer.blocking and executor is not None:
+                    submit(consumer)
+
+        def submit(node):
+            started.add(node)
+            args = [values[key] for key in node.inputs]
+            running[executor.submit(self._call, node, args)] = node
+
+        def wait_for_one():
+            done, _ = wait(running, timeout=time_left(deadline), return_when=FIRST_COMPLETED)
+            if not done:
+                abandon(running)
+            for future in done:
+                finish(running.pop(future), future.result())
+
+        try:
+            for node in order:
+                if node.blocking and executor is not None:
+                    if not remaining[node] and node not in started:
+                        submit(node)
+                    continue
+
+                while remaining[node] and running:
+                    wait_for_one()
+
+                if remaining[node]:
+                    continue
+
+                finish(node, self._call(node, [values[key] for key in node.inputs]))
+
+            while running:
+                wait_for_one()
+
+        finally:
+            abandon(running)
+
+        return values
+
+    async def run_async(self, values, targets=None, executor=None, deadline=None):
+
+        remaining, consumers, order = self.plan(targets)
+        values = dict(values)
+        remaining = dict(remaining)
+        running = {}
+        started = set()
+        loop = asyncio.get_running_loop()
+
+        def finish(node, result):
+            for consumer in self._store(node, result, values, consumers, remaining):
+                if consumer.blocking:
+                    submit(consumer)
+
+        def submit(node):
+            started.add(node)
+            args = [values[key] for key in node.inputs]
+            if node.async_fn is not None:
+                task = asyncio.ensure_future(self._call_async(node, args))
+            else:
+                task = loop.run_in_executor(executor, self._call, node, args)
+            running[task] = node
+
+        async def wait_for_one():
+            done, _ = await asyncio.wait(
+                running, timeout=time_left(deadline), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                abandon(running)
+            for task in done:
+                finish(running.pop(task), task.result())
+
+        try:
+            for node in order:
+                if node.blocking:
+                    if not remaining[node] and node not in started:
+                        submit(node)
+                    # Let the task reach its first await before the inline
+                    # nodes take the event loop
+                    await asyncio.sleep(0)
+                    continue
+
+                while remaining[node] and running:
+                    await wait_for_one()
+
+                if remaining[node]:
+                    continue
+
+                finish(node, self._call(node, [values[key] for key in node.inputs]))
+
+            while running:
+                await wait_for_one()
+
+        finally:
+            abandon(running)
+
+        return values
+
+    def _store(self, node, result, values, consumers, remaining):
+
+        # Saves the outputs and returns the consumers that became ready
+        if len(node.outputs) == 1:
+            values[node.outputs[0]] = result
+        else:
+            values.update(zip(node.outputs, result))
+
+        ready = []
+
+        for consumer in consumers[node]:
+            remaining[consumer] -= 1
+            if not remaining[consumer]:
+                ready.append(consumer)
+
+        return ready
+
+    def _call(self, node, args):
+
+        if node.timed and self.metrics is not None:
+            return self.metrics.call(node.name, node.fn, *args)
+
+        return node.fn(*args)
+
+    async def _call_async(self, node, args):
+
+        if not node.timed or self.metrics is None:
+            return await node.async_fn(*args)
+
+        start = time.perf_counter_ns()
+
+        try:
+            return await node.async_fn(*args)
+
+        except Exception:
+            self.metrics.record_error(node.name)
+            raise
+
+        finally:
+            self.metrics.record(node.name, time.perf_counter_ns() - start)
+
+
+def time_left(deadline):
+
+    if deadline is None:
+        return None
+
+    return max(0.0, deadline - time.monotonic())
+
+
+def abandon(running):
+
+    # Cancel drops work still queued; a call already in progress keeps
+    # its thread until it returns, but nothing waits for it any more
+    for pending in running:
+        pending.cancel()
+
+    running.clear()
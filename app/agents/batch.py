@@ -0,0 +1,59 @@
+import numpy as np
+
+
+class RouteBatch:
+
+    def __init__(self, requests):
+
+        self.requests = list(requests)
+        size = len(self.requests)
+
+        self.sources = [r.source for r in self.requests]
+        self.destinations = [r.destination for r in self.requests]
+        self.priorities = [r.priority for r in self.requests]
+
+        self.cargo_weight = np.fromiter(
+            (r.cargo_weight for r in self.requests), dtype=np.float64, count=size
+        )
+        self.high_priority = np.fromiter(
+            (p.lower() == "high" for p in self.priorities), dtype=bool, count=size
+        )
+
+    def __len__(self):
+        return len(self.requests)
+
+
+def round_values(values, ndigits=2):
+
+    # np.round() is not correctly rounded like Python's round(): the
+    # scaled product can land on the wrong side of a .5 tie. Away from
+    # ties rint(x * 10**n) / 10**n is exact, so only near-ties (and
+    # values too large for the trick) fall back to round().
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+
+    magnitude = np.abs(scaled)
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= 1e-9 * np.maximum(1.0, magnitude)
+    near_tie |= ~(magnitude < 2.0 ** 52)
+
+    for i in np.flatnonzero(near_tie).tolist():
+        rounded[i] = round(float(values[i]), ndigits)
+
+    return rounded
+
+
+def round_scores(values):
+
+    # Round-half-even to int, same as round() on a single float.
+    return np.rint(values).astype(np.int64)
+
+
+def choose(conditions, choices, default):
+
+    # np.select over constant strings. The result is an object array of
+    # the constants themselves, so tolist() gives every row the same str
+    # instead of a fresh copy per row like a unicode array would.
+    constants = np.array([*choices, default], dtype=object)
+
+    return constants[np.select(conditions, list(range(len(choices))), len(choices))]
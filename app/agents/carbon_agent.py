@@ -1,5 +1,23 @@
+from .batch import round_values
+from .route_engine import RouteEngine, REFERENCE_DISTANCE_KM
+
+
 class CarbonAgent:
 
+    def __init__(self, engine=None):
+        self.engine = engine or RouteEngine.default()
+
     def calculate(self, request):
+        # kg CO₂ per kg over the 1000 km reference lane, i.e. 0.8 per tonne-km
+        carbon_factor = 0.8
+        lane_factor = self.engine.lane_factor(request.source, request.destination)
+        return round(request.cargo_weight * carbon_factor * lane_factor, 2)
+
+    def calculate_leg(self, cargo_weight, distance_km):
+        carbon_factor = 0.8
+        return round(cargo_weight * carbon_factor * (distance_km / REFERENCE_DISTANCE_KM), 2)
+
+    def calculate_batch(self, batch):
         carbon_factor = 0.8
-        return round(request.cargo_weight * carbon_factor, 2)
+        lane_factor = self.engine.lane_factor_batch(batch.sources, batch.destinations)
+        return round_values(batch.cargo_weight * carbon_factor * lane_factor)
@@ -1,38 +1,319 @@
+import numpy as np
+
+from .batch import round_values, round_scores
+from .models.route_models import AlternativeRoute
+from .pareto import pareto_front
+from .route_engine import RouteEngine, REFERENCE_DISTANCE_KM
+
+
+# mode, vehicle class, cost and carbon per tonne-km, speed in km/h and
+# fixed handling hours. Rigid Truck matches the Cost and Carbon Agents.
+ROAD_CLASSES = (
+    ("road", "LCV", 3.1, 1.05, 55.0, 2.0),
+    ("road", "Rigid Truck", 2.5, 0.8, 50.0, 3.0),
+    ("road", "Tractor-Trailer", 2.1, 0.62, 45.0, 5.0),
+    ("road", "Electric Truck", 2.9, 0.25, 42.0, 6.0)
+)
+
+RAIL_CLASSES = (
+    ("rail", "Container Rail", 1.6, 0.22, 38.0, 20.0),
+    ("rail", "Bulk Rail", 1.2, 0.18, 28.0, 36.0)
+)
+
+AIR_CLASSES = (
+    ("air", "Belly Cargo", 9.5, 4.8, 650.0, 14.0),
+    ("air", "Freighter", 12.0, 5.6, 700.0, 8.0)
+)
+
+SEA_CLASSES = (
+    ("sea", "Coastal Feeder", 0.6, 0.1, 26.0, 48.0),
+)
+
+# Distance relative to the road lane (air: to the great circle)
+CIRCUITY = {"rail": 1.05, "air": 1.05, "sea": 1.4}
+
+# Hours to transfer cargo between road and trunk at a terminal
+TRANSFER_HOURS = 6.0
+
+# name, then cost, carbon and hours multipliers
+SERVICE_LEVELS = (
+    ("Economy", 0.9, 1.0, 1.3),
+    ("Standard", 1.0, 1.0, 1.0),
+    ("Express", 1.25, 1.05, 0.75)
+)
+
+# Cost, carbon and time weights for picking the recommended point
+PRIORITY_WEIGHTS = {
+    "high": (0.25, 0.15, 0.6),
+    "low": (0.3, 0.55, 0.15)
+}
+BALANCED_WEIGHTS = (0.4, 0.3, 0.3)
+
+FRONTIER_CACHE_SIZE = 4096
+
+
 class ComparisonAgent:
 
+    def __init__(self, engine=None):
+        self.engine = engine or RouteEngine.default()
+        self._frontiers = {}
+
     def generate_alternatives(self, request):
 
-        # Express Route
-        express_cost = request.cargo_weight * 3
-        express_carbon = request.cargo_weight * 1.2
+        frontier = self.frontier(request.source, request.destination)
+        best, recommendation = self.recommend(frontier, request.priority)
 
-        # Eco Route
-        eco_cost = request.cargo_weight * 2.6
-        eco_carbon = request.cargo_weight * 0.6
+        weight = request.cargo_weight
+        alternatives = []
 
-        express_score = max(0, round(100 - (express_carbon * 0.5)))
-        eco_score = max(0, round(100 - (eco_carbon * 0.5)))
+        for i, (cost, carbon) in enumerate(zip(frontier["cost_list"], frontier["carbon_list"])):
 
+            carbon_value = weight * carbon
 
-        alternatives = [
-            {
-                "route": f"{request.source} → {request.destination} (Express)",
-                "cost": round(express_cost, 2),
-                "carbon": round(express_carbon, 2),
-                "sustainability_score": round(express_score)
-            },
+            alternatives.append(AlternativeRoute(
+                *frontier["option_values"][i],
+                round(weight * cost, 2),
+                round(carbon_value, 2),
+                max(0, round(100 - (carbon_value * 0.5))),
+                i == best
+            ))
+
+        return alternatives, recommendation
+
+    def generate_alternatives_batch(self, batch):
+
+        alternatives = [None] * len(batch)
+        recommendations = [None] * len(batch)
+
+        lanes = {}
+        for i, lane in enumerate(zip(batch.sources, batch.destinations)):
+            lanes.setdefault(lane, []).append(i)
+
+        # Cost and carbon are linear in weight and transit time does not
+        # depend on it, so one frontier serves every row on a lane.
+        for (source, destination), rows in lanes.items():
+
+            frontier = self.frontier(source, destination)
+            options = frontier["option_values"]
+            width = len(options)
+
+            weight = batch.cargo_weight[rows][:, None]
+            carbon_raw = (weight * frontier["carbon"]).ravel()
+
+            cost = round_values((weight * frontier["cost"]).ravel()).tolist()
+            carbon = round_values(carbon_raw).tolist()
+            scores = np.maximum(0, round_scores(100 - (carbon_raw * 0.5))).tolist()
+
+            for offset, row in enumerate(rows):
+
+                best, recommendation = self.recommend(frontier, batch.priorities[row])
+                start = offset * width
+
+                alternatives[row] = [
+                    AlternativeRoute(
+                        *options[i], cost[start + i], carbon[start + i], scores[start + i], i == best
+                    )
+                    for i in range(width)
+                ]
+                recommendations[row] = recommendation
+
+        return alternatives, recommendations
+
+    def frontier(self, source, destination):
+
+        key = (source, destination)
+        frontier = self._frontiers.get(key)
+
+        if frontier is not None:
+            return frontier
+
+        cost, carbon, hours, options = self.candidates(source, destination)
+        front = pareto_front(cost, carbon, hours)
+
+        frontier = {
+            "candidates": len(options),
+            "cost": cost[front],
+            "carbon": carbon[front],
+            "hours": hours[front],
+            "cost_list": cost[front].tolist(),
+            "carbon_list": carbon[front].tolist(),
+            "options": [
+                {**options[i], "transit_hours": round(float(hours[i]), 1)}
+                for i in front
+            ],
+            "recommended": {}
+        }
+
+        # The same options as AlternativeRoute's leading fields, in order
+        frontier["option_values"] = [
+            (option["route"], option["mode"], option["vehicle_class"], option["service_level"], option["transit_hours"])
+            for option in frontier["options"]
+        ]
+
+        if len(self._frontiers) >= FRONTIER_CACHE_SIZE:
+            self._frontiers.pop(next(iter(self._frontiers)))
+
+        self._frontiers[key] = frontier
+
+        return frontier
+
+    def recommend(self, frontier, priority):
+
+        weights = PRIORITY_WEIGHTS.get(priority.lower(), BALANCED_WEIGHTS)
+        cached = frontier["recommended"].get(weights)
+
+        if cached is not None:
+            return cached
+
+        # Weighted sum of objectives scaled to [0, 1] across the frontier.
+        # Scaling the per-kg values keeps the choice independent of weight.
+        score = np.zeros(len(frontier["options"]))
+
+        for weight, values in zip(weights, (frontier["cost"], frontier["carbon"], frontier["hours"])):
+            spread = values.max() - values.min()
+            if spread > 0:
+                score += weight * (values - values.min()) / spread
+
+        best = int(np.argmin(score))
+        option = frontier["options"][best]
+
+        if weights is BALANCED_WEIGHTS:
+            focus = "balanced"
+        elif weights is PRIORITY_WEIGHTS["high"]:
+            focus = "time-weighted"
+        else:
+            focus = "carbon-weighted"
+
+        recommendation = (
+            f"{option['vehicle_class']} ({option['mode']}, {option['service_level']}) selected "
+            f"as the best {focus} point on the cost–carbon–time frontier "
+            f"({len(frontier['options'])} of {frontier['candidates']} options non-dominated)."
+        )
+
+        frontier["recommended"][weights] = (best, recommendation)
+
+        return best, recommendation
+
+    def candidates(self, source, destination):
+
+        # Per-kg cost and carbon, transit hours and a description of every
+        # mode, vehicle class and service level that can serve the lane.
+        engine = self.engine
+        road = engine.lane_distance(source, destination)
+
+        legs = []
+
+        for mode, vehicle_class, cost, carbon, speed, handling in ROAD_CLASSES:
+            legs.append((mode, vehicle_class, [source, destination], road, cost, carbon, road / speed + handling))
+
+        known = source in engine.index and destination in engine.index
+
+        if known and source != destination:
+
+            air = engine.great_circle_km(source, destination) * CIRCUITY["air"]
+            direct = [(RAIL_CLASSES, road * CIRCUITY["rail"]), (AIR_CLASSES, air)]
+
+            if source in engine.ports and destination in engine.ports:
+                direct.append((SEA_CLASSES, road * CIRCUITY["sea"]))
+
+            for classes, distance in direct:
+                for mode, vehicle_class, cost, carbon, speed, handling in classes:
+                    legs.append((
+                        mode, vehicle_class, [source, destination],
+                        distance, cost, carbon, distance / speed + handling
+                    ))
+
+        cost = np.array([leg[4] * leg[3] for leg in legs]) / REFERENCE_DISTANCE_KM
+        carbon = np.array([leg[5] * leg[3] for leg in legs]) / REFERENCE_DISTANCE_KM
+        hours = np.array([leg[6] for leg in legs])
+        options = [
             {
-                "route": f"{request.source} → {request.destination} (Eco)",
-                "cost": round(eco_cost, 2),
-                "carbon": round(eco_carbon, 2),
-                "sustainability_score": round(eco_score)
+                "route": " → ".join(leg[2]) + f" ({leg[1]})",
+                "mode": leg[0],
+                "vehicle_class": leg[1]
             }
+            for leg in legs
         ]
 
-        # Recommendation logic
-        if eco_score > express_score:
-            recommendation = "Eco Route Selected due to better sustainability-to-cost balance."
-        else:
-            recommendation = "Express Route Selected due to priority efficiency."
+        if known and source != destination:
+            intermodal = self.intermodal_candidates(source, destination)
+            cost = np.concatenate((cost, intermodal[0]))
+            carbon = np.concatenate((carbon, intermodal[1]))
+            hours = np.concatenate((hours, intermodal[2]))
+            options += intermodal[3]
 
-        return alternatives, recommendation
+        # Every option is offered at each service level
+        cost = np.concatenate([cost * level[1] for level in SERVICE_LEVELS])
+        carbon = np.concatenate([carbon * level[2] for level in SERVICE_LEVELS])
+        hours = np.concatenate([hours * level[3] for level in SERVICE_LEVELS])
+        options = [
+            {**option, "service_level": level[0]}
+            for level in SERVICE_LEVELS
+            for option in options
+        ]
+
+        return cost, carbon, hours, options
+
+    def intermodal_candidates(self, source, destination):
+
+        # Road to an origin terminal, rail or sea between terminal hubs,
+        # road from the destination terminal: one candidate per terminal
+        # pair, road class and trunk class.
+        engine = self.engine
+        hubs = engine.hubs
+
+        first = np.array([0.0 if hub == source else engine.lane_distance(source, hub) for hub in hubs])
+        last = np.array([0.0 if hub == destination else engine.lane_distance(hub, destination) for hub in hubs])
+
+        a, b = np.nonzero(np.isfinite(engine.hub_distance) & ~np.eye(len(hubs), dtype=bool))
+
+        # A trunk straight from source to destination is the direct option,
+        # and no plan should pass back through either end
+        keep = (first[a] > 0) | (last[b] > 0)
+        keep &= (np.array(hubs)[a] != destination) & (np.array(hubs)[b] != source)
+        a, b = a[keep], b[keep]
+
+        road_km = first[a] + last[b]
+        transfers = (first[a] > 0).astype(float) + (last[b] > 0)
+        trunk_km = engine.hub_distance[a, b].astype(np.float64)
+
+        ports = np.array([hub in engine.ports for hub in hubs])
+        sea = ports[a] & ports[b]
+
+        costs, carbons, hours, options = [], [], [], []
+
+        for trunk_classes, mask in ((RAIL_CLASSES, np.ones(len(a), dtype=bool)), (SEA_CLASSES, sea)):
+
+            if not mask.any():
+                continue
+
+            trunk = trunk_km[mask] * CIRCUITY[trunk_classes[0][0]]
+            road_leg = road_km[mask]
+            transfer_hours = transfers[mask] * TRANSFER_HOURS
+
+            routes = [
+                " → ".join(dict.fromkeys([source, hubs[x], hubs[y], destination]))
+                for x, y in zip(a[mask].tolist(), b[mask].tolist())
+            ]
+
+            for _, road_class, road_cost, road_carbon, road_speed, road_handling in ROAD_CLASSES:
+                for _, trunk_class, trunk_cost, trunk_carbon, trunk_speed, trunk_handling in trunk_classes:
+
+                    costs.append((road_leg * road_cost + trunk * trunk_cost) / REFERENCE_DISTANCE_KM)
+                    carbons.append((road_leg * road_carbon + trunk * trunk_carbon) / REFERENCE_DISTANCE_KM)
+                    hours.append(
+                        road_leg / road_speed + road_handling
+                        + trunk / trunk_speed + trunk_handling
+                        + transfer_hours
+                    )
+
+                    vehicle_class = f"{road_class} + {trunk_class}"
+                    options += [
+                        {"route": f"{route} ({vehicle_class})", "mode": "intermodal", "vehicle_class": vehicle_class}
+                        for route in routes
+                    ]
+
+        if not costs:
+            return np.empty(0), np.empty(0), np.empty(0), []
+
+        return np.concatenate(costs), np.concatenate(carbons), np.concatenate(hours), options
@@ -1,5 +1,23 @@
+from .batch import round_values
+from .route_engine import RouteEngine, REFERENCE_DISTANCE_KM
+
+
 class CostAgent:
 
+    def __init__(self, engine=None):
+        self.engine = engine or RouteEngine.default()
+
     def calculate(self, request):
+        # Per kg over the 1000 km reference lane, i.e. 2.5 per tonne-km
+        base_rate = 2.5
+        lane_factor = self.engine.lane_factor(request.source, request.destination)
+        return round(request.cargo_weight * base_rate * lane_factor, 2)
+
+    def calculate_leg(self, cargo_weight, distance_km):
+        base_rate = 2.5
+        return round(cargo_weight * base_rate * (distance_km / REFERENCE_DISTANCE_KM), 2)
+
+    def calculate_batch(self, batch):
         base_rate = 2.5
-        return round(request.cargo_weight * base_rate, 2)
+        lane_factor = self.engine.lane_factor_batch(batch.sources, batch.destinations)
+        return round_values(batch.cargo_weight * base_rate * lane_factor)
@@ -11,3 +11,16 @@ class ExplanationAgent:
         )
 
         return explanation
+
+    def generate_batch(self, routes, cost, carbon, risk, sustainability_score):
+
+        return [
+            self.generate(*row)
+            for row in zip(
+                routes,
+                cost.tolist(),
+                carbon.tolist(),
+                risk.tolist(),
+                sustainability_score.tolist()
+            )
+        ]
@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 from pydantic import BaseModel
 
 class RouteRequest(BaseModel):
@@ -7,8 +9,57 @@ class RouteRequest(BaseModel):
     priority: str
 
 
-class RouteResponse(BaseModel):
-    optimized_route: str
+# Nested result entries. Each result holds many of them, so they are
+# slotted objects rather than dicts; the JSON is the same.
+@dataclass(slots=True)
+class AlternativeRoute:
+    route: str
+    mode: str
+    vehicle_class: str
+    service_level: str
+    transit_hours: float
+    cost: float
+    carbon: float
+    sustainability_score: int
+    recommended: bool
+
+
+@dataclass(slots=True)
+class SimulationScenario:
+    scenario: str
     estimated_cost: float
     carbon_impact: float
-    risk_level: str
\ No newline at end of file
+    sustainability_score: int
+
+
+class OptimizationResult(BaseModel):
+
+    # Response schema only; results are serialized without building it.
+    # Every field is optional since ?fields= and the deadline leave some out.
+    optimized_route: str | None = None
+    route_path: list[str] | None = None
+    route_distance_km: float | None = None
+    estimated_cost: float | None = None
+    carbon_impact: float | None = None
+    risk_level: str | None = None
+    sustainability_score: int | None = None
+    eco_recommendation: str | None = None
+    emission_category: str | None = None
+    optimization_confidence_score: int | None = None
+    decision_explanation: str | None = None
+    ai_reasoning: str | None = None
+    alternative_routes: list[AlternativeRoute] | None = None
+    recommended_strategy: str | None = None
+    simulation_analysis: list[SimulationScenario] | None = None
+    overall_performance_index: int | None = None
+    reasoning_job_id: str | None = None
+    degraded: bool | None = None
+    degraded_fields: list[str] | None = None
+
+
+class RouteResponse(BaseModel):
+    result: OptimizationResult
+
+
+class BatchRouteResponse(BaseModel):
+    results: list[OptimizationResult]
@@ -1,3 +1,13 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import numpy as np
+
+from .agent_graph import AgentGraph, AgentNode, time_left
 from .route_agent import RouteAgent
 from .cost_agent import CostAgent
 from .carbon_agent import CarbonAgent
@@ -5,11 +15,46 @@ from .risk_agent import RiskAgent
 from .sustainability_agent import SustainabilityAgent
 from .explanation_agent import ExplanationAgent
 from app.services.ai_service import NovaAIService
+from app.services.reasoning_jobs import ReasoningJobs
+from app.services.agent_metrics import agent_metrics
+from app.services.prometheus_metrics import metrics
+from app.services.result_cache import CachedResult, ResultCache
 from .comparison_agent import ComparisonAgent
 from .simulation_agent import SimulationAgent
 from .performance_agent import PerformanceAgent
+from .vehicle_routing_agent import VehicleRoutingAgent
+from .batch import RouteBatch, round_values
+from . import route_engine
+
+
+AI_REASONING_UNAVAILABLE = "AI reasoning temporarily unavailable"
+
+# Result fields in response order and the graph value each one reads
+RESULT_FIELDS = {
+    "optimized_route": "route",
+    "route_path": "route_plan",
+    "route_distance_km": "route_plan",
+    "estimated_cost": "cost",
+    "carbon_impact": "carbon",
+    "risk_level": "risk",
+    "sustainability_score": "sustainability",
+    "eco_recommendation": "sustainability",
+    "emission_category": "sustainability",
+    "optimization_confidence_score": "sustainability",
+    "decision_explanation": "explanation",
+    "ai_reasoning": "ai_reasoning",
+    "alternative_routes": "alternatives",
+    "recommended_strategy": "recommendation",
+    "simulation_analysis": "simulations",
+    "overall_performance_index": "performance_index"
+}
 
+ALL_FIELDS = tuple(RESULT_FIELDS)
 
+# Graph outputs that make up a full optimize result, reasoning aside
+RESULT_KEYS = tuple(dict.fromkeys(
+    key for key in RESULT_FIELDS.values() if key != "ai_reasoning"
+))
 
 
 class LogisticsOrchestrator:
@@ -21,22 +66,387 @@ class LogisticsOrchestrator:
         self.risk_agent = RiskAgent()
         self.sustainability_agent = SustainabilityAgent()
         self.explanation_agent = ExplanationAgent()
-        self.ai_service = NovaAIService()
         self.comparison_agent = ComparisonAgent()
-        self.simulation_agent = SimulationAgent()
+        self.simulation_agent = SimulationAgent(sustainability_agent=self.sustainability_agent)
         self.performance_agent = PerformanceAgent()
+        self.vehicle_routing_agent = VehicleRoutingAgent(
+            self.cost_agent, self.carbon_agent, self.sustainability_agent
+        )
+        self.reasoning_jobs = ReasoningJobs()
+        self.metrics = agent_metrics
+
+        # NovaAIService is built on first use (see ai_service)
+        self._ai_service = None
+        self._ai_service_lock = threading.Lock()
+
+        # Runs blocking graph nodes (the sync reasoning call) off the caller
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("AGENT_GRAPH_WORKERS", "8")),
+            thread_name_prefix="agent-graph"
+        )
+        self.graph = AgentGraph(self.build_nodes(), metrics=self.metrics)
+
+        # Latency budget for one optimize call. Whatever has not finished
+        # by then (in practice the Bedrock call) is left out and the
+        # result is marked degraded; 0 disables it.
+        self.deadline_seconds = float(os.getenv("OPTIMIZE_DEADLINE_SECONDS", "10"))
+
+        # Deterministic results by lane, weight, priority and fields
+        self.result_cache = ResultCache.from_env(self.parameter_fingerprint)
+
+    @property
+    def ai_service(self):
+
+        # Deterministic requests never build the AI service, so a cold
+        # worker answers them before anything touches Bedrock
+        if self._ai_service is None:
+            with self._ai_service_lock:
+                if self._ai_service is None:
+                    self._ai_service = NovaAIService()
+
+        return self._ai_service
+
+    @ai_service.setter
+    def ai_service(self, service):
+        self._ai_service = service
+
+    def optimize(self, request, fields=None):
+
+        # fields limits the result to those keys and runs only the agents
+        # they depend on; None returns everything
+        fields = self.select_fields(fields)
+
+        entry, ai_reasoning, degraded = self.resolve(request, fields)
+
+        return self.finish_result(entry, fields, ai_reasoning, degraded)
+
+    async def optimize_async(self, request, fields=None):
+
+        fields = self.select_fields(fields)
+
+        entry, ai_reasoning, degraded = await self.resolve_async(request, fields)
+
+        return self.finish_result(entry, fields, ai_reasoning, degraded)
+
+    async def optimize_deferred(self, request, fields=None):
+
+        # Return the deterministic result now; reasoning is fetched later
+        # by job id through reasoning_status / wait_for_reasoning.
+        fields = self.select_fields(fields)
+
+        entry, job_id = self.resolve_deferred(request, fields)
+        result = dict(entry.result)
+
+        if job_id is not None:
+            result["reasoning_job_id"] = job_id
+
+        return result
+
+    async def optimize_json(self, request, fields=None, defer_reasoning=False):
+
+        # Same result as optimize_async or optimize_deferred, serialized.
+        # Cached fields are spliced in as stored; only reasoning is encoded.
+        fields = self.select_fields(fields)
+
+        if defer_reasoning:
+            entry, job_id = self.resolve_deferred(request, fields)
+            return entry.render(extra=None if job_id is None else {"reasoning_job_id": job_id})
+
+        entry, ai_reasoning, degraded = await self.resolve_async(request, fields)
+        extra = self.degraded_marker(degraded)
+
+        if "ai_reasoning" not in fields:
+            return entry.render(extra=extra)
+
+        return entry.render(self.attach_reasoning({}, ai_reasoning), extra)
+
+    def resolve(self, request, fields):
+
+        # Cached deterministic result plus fresh reasoning (which has its
+        # own cache in the AI service); a miss runs the whole graph.
+        # Also returns the fields that missed the deadline or failed.
+        deadline = self.deadline()
+        key = self.result_cache.make_key(request, fields)
+        entry = self.result_cache.get(key)
+
+        if entry is not None:
+
+            if "ai_reasoning" not in fields:
+                return entry, None, ()
+
+            future = self.executor.submit(self.ai_service.generate_reasoning, entry.reasoning_context)
 
+            try:
+                ai_reasoning = future.result(timeout=time_left(deadline))
+            except TimeoutError:
+                future.cancel()
+                ai_reasoning = None
+
+            return entry, ai_reasoning, self.degraded_fields(("ai_reasoning",), {"ai_reasoning": ai_reasoning})
+
+        values = self.graph.run(
+            {"request": self.result_cache.quantize(request)},
+            self.graph_targets(fields), self.executor, deadline
+        )
+
+        return self.store(key, values, fields), values.get("ai_reasoning"), self.degraded_fields(fields, values)
+
+    async def resolve_async(self, request, fields):
+
+        # Reasoning starts as soon as its inputs exist and the remaining
+        # deterministic agents run while the model call is in flight
+        deadline = self.deadline()
+        key = self.result_cache.make_key(request, fields)
+        entry = self.result_cache.get(key)
+
+        if entry is not None:
+
+            if "ai_reasoning" not in fields:
+                return entry, None, ()
+
+            try:
+                ai_reasoning = await asyncio.wait_for(
+                    self.ai_service.generate_reasoning_async(entry.reasoning_context),
+                    timeout=time_left(deadline)
+                )
+            except asyncio.TimeoutError:
+                ai_reasoning = None
+
+            return entry, ai_reasoning, self.degraded_fields(("ai_reasoning",), {"ai_reasoning": ai_reasoning})
+
+        values = await self.graph.run_async(
+            {"request": self.result_cache.quantize(request)},
+            self.graph_targets(fields), self.executor, deadline
+        )
+
+        return self.store(key, values, fields), values.get("ai_reasoning"), self.degraded_fields(fields, values)
+
+    def deadline(self):
+
+        if self.deadline_seconds <= 0:
+            return None
+
+        return time.monotonic() + self.deadline_seconds
+
+    def degraded_fields(self, fields, values):
+
+        # Fields left out by the deadline, plus reasoning that came back
+        # empty because Bedrock failed or the circuit was open
+        degraded = [
+            field for field in fields
+            if RESULT_FIELDS[field] not in values
+            or (field == "ai_reasoning" and not values["ai_reasoning"])
+        ]
+
+        for field in degraded:
+            metrics.inc("ecosmart_optimize_degraded_total", field=field)
+
+        return degraded
+
+    def degraded_marker(self, degraded):
+
+        if not degraded:
+            return None
+
+        return {"degraded": True, "degraded_fields": list(degraded)}
+
+    def resolve_deferred(self, request, fields):
+
+        entry = self.evaluate_entry(request, fields)
+
+        if "ai_reasoning" not in fields:
+            return entry, None
+
+        job_id = self.reasoning_jobs.submit(
+            self.ai_service.generate_reasoning_async(entry.reasoning_context)
+        )
+
+        return entry, job_id
+
+    def reasoning_status(self, job_id):
+
+        task = self.reasoning_jobs.get(job_id)
+
+        if task is None:
+            return None
+
+        if not task.done():
+            return {"job_id": job_id, "status": "pending", "ai_reasoning": None}
+
+        return self.attach_reasoning(
+            {"job_id": job_id, "status": "completed"},
+            self.reasoning_jobs.result(job_id)
+        )
+
+    async def wait_for_reasoning(self, job_id):
+
+        if self.reasoning_jobs.get(job_id) is None:
+            return None
+
+        return self.attach_reasoning(
+            {"job_id": job_id, "status": "completed"},
+            await self.reasoning_jobs.wait(job_id)
+        )
 
+    def attach_reasoning(self, result, ai_reasoning):
+        result["ai_reasoning"] = ai_reasoning if ai_reasoning else AI_REASONING_UNAVAILABLE
+        return result
 
-    def optimize(self, request):
+    def evaluate(self, request, fields=None):
 
-        # Step 1: Base Calculations
-        route = self.route_agent.get_route(request)
-        cost = self.cost_agent.calculate(request)
-        carbon = self.carbon_agent.calculate(request)
-        risk = self.risk_agent.analyze(request)
+        # Deterministic result with an ai_reasoning placeholder, plus the
+        # context the reasoning call needs when ai_reasoning is selected
+        fields = self.select_fields(fields)
 
-        # Step 2: Agent Collaboration Logic
+        entry = self.evaluate_entry(request, fields)
+
+        return dict(entry.result), entry.reasoning_context
+
+    def evaluate_entry(self, request, fields):
+
+        key = self.result_cache.make_key(request, fields)
+        entry = self.result_cache.get(key)
+
+        if entry is None:
+
+            targets = tuple(target for target in self.graph_targets(fields) if target != "ai_reasoning")
+            if "ai_reasoning" in fields:
+                targets += ("reasoning_context",)
+
+            values = self.graph.run(
+                {"request": self.result_cache.quantize(request)}, targets, self.executor
+            )
+            entry = self.store(key, values, fields)
+
+        return entry
+
+    def store(self, key, values, fields):
+
+        # Reasoning is never part of the cached result, only a placeholder
+        result = self.build_result({**values, "ai_reasoning": None}, fields)
+
+        # A result cut short by the deadline is served once, not cached
+        if any(RESULT_FIELDS[field] not in values for field in fields if field != "ai_reasoning"):
+            return CachedResult(result, values.get("reasoning_context"))
+
+        return self.result_cache.set(key, result, values.get("reasoning_context"))
+
+    def parameter_fingerprint(self):
+
+        # Agent rates and tables live in code and module constants, so
+        # hash those together with the agent instances and what they hold.
+        # Editing, reloading or swapping any of them changes the value.
+        parts = []
+
+        for owner in (
+            self, self.route_agent, self.cost_agent, self.carbon_agent, self.risk_agent,
+            self.sustainability_agent, self.explanation_agent, self.comparison_agent,
+            self.simulation_agent, self.performance_agent
+        ):
+            cls = type(owner)
+
+            parts.append(id(owner))
+            parts += [getattr(member, "__code__", None) for member in vars(cls).values()]
+            parts += [
+                (name, repr(value))
+                for name, value in vars(sys.modules[cls.__module__]).items()
+                if name.isupper()
+            ]
+            # The result cache is not a parameter, and it is only assigned
+            # after the baseline fingerprint has been taken
+            parts += [
+                (name, value if isinstance(value, (int, float, str, bool)) else id(value))
+                for name, value in vars(owner).items()
+                if not name.startswith("_") and name != "result_cache"
+            ]
+
+        parts += [(name, repr(value)) for name, value in vars(route_engine).items() if name.isupper()]
+
+        return hash(tuple(parts))
+
+    def select_fields(self, fields):
+
+        if fields is None:
+            return ALL_FIELDS
+
+        fields = set(fields)
+        unknown = fields.difference(RESULT_FIELDS)
+
+        if unknown:
+            raise ValueError(f"Unknown result fields: {', '.join(sorted(unknown))}")
+
+        return tuple(field for field in ALL_FIELDS if field in fields)
+
+    def graph_targets(self, fields):
+        return tuple(dict.fromkeys(RESULT_FIELDS[field] for field in fields))
+
+    def build_nodes(self):
+
+        # Each agent declares what it reads and what it produces; the
+        # graph runs whatever is ready, in this order when there is a tie.
+        return [
+
+            # Step 1: Base Calculations
+            AgentNode("Route Agent", self.plan_route, ("request",), ("route_plan", "route")),
+            AgentNode("Cost Agent", self.cost_agent.calculate, ("request",), ("base_cost",)),
+            AgentNode("Carbon Agent", self.carbon_agent.calculate, ("request",), ("base_carbon",)),
+            AgentNode("Risk Agent", self.risk_agent.analyze, ("request",), ("risk",)),
+
+            # Step 2: Agent Collaboration Logic
+            AgentNode(
+                "Collaboration Rules", self.collaborate,
+                ("request", "base_cost", "base_carbon", "risk"), ("cost", "carbon"),
+                timed=False
+            ),
+            AgentNode(
+                "Sustainability Agent",
+                lambda carbon, request: self.sustainability_agent.evaluate(carbon, request.cargo_weight),
+                ("carbon", "request"), ("sustainability",)
+            ),
+            AgentNode(
+                "Reasoning Context", self.reasoning_context,
+                ("route", "cost", "carbon", "risk", "sustainability"), ("reasoning_context",),
+                timed=False
+            ),
+
+            # The service records its own timings as Nova Reasoning Agent
+            AgentNode(
+                "Nova Reasoning",
+                lambda context: self.ai_service.generate_reasoning(context),
+                ("reasoning_context",), ("ai_reasoning",),
+                blocking=True,
+                async_fn=lambda context: self.ai_service.generate_reasoning_async(context),
+                timed=False
+            ),
+
+            AgentNode(
+                "Explanation Agent",
+                lambda route, cost, carbon, risk, sustainability: self.explanation_agent.generate(
+                    route, cost, carbon, risk, sustainability["sustainability_score"]
+                ),
+                ("route", "cost", "carbon", "risk", "sustainability"), ("explanation",)
+            ),
+            AgentNode(
+                "Comparison Agent", self.comparison_agent.generate_alternatives,
+                ("request",), ("alternatives", "recommendation")
+            ),
+            AgentNode("Simulation Agent", self.simulation_agent.simulate, ("request",), ("simulations",)),
+            AgentNode(
+                "Performance Agent",
+                lambda cost, carbon, sustainability, risk: self.performance_agent.calculate(
+                    cost, carbon, sustainability["sustainability_score"], risk
+                ),
+                ("cost", "carbon", "sustainability", "risk"), ("performance_index",)
+            )
+        ]
+
+    def plan_route(self, request):
+
+        route_plan = self.route_agent.plan(request)
+
+        return route_plan, " → ".join(route_plan["path"])
+
+    def collaborate(self, request, cost, carbon, risk):
 
         # If high priority, increase cost slightly (fast delivery route)
         if request.priority.lower() == "high":
@@ -50,47 +460,202 @@ class LogisticsOrchestrator:
         if risk == "Elevated":
             carbon *= 1.1
 
-        sustainability = self.sustainability_agent.evaluate(
-            carbon, request.cargo_weight
-        )
+        return cost, carbon
 
-        explanation = self.explanation_agent.generate(
-            route, cost, carbon, risk, sustainability["sustainability_score"]
-        )
-
-        ai_reasoning = self.ai_service.generate_reasoning({
+    def reasoning_context(self, route, cost, carbon, risk, sustainability):
+        return {
                 "route": route,
                 "cost": round(cost,2),
                 "carbon": round(carbon,2),
                 "risk": risk,
                 "score": sustainability["sustainability_score"]
-            })
-
-        alternatives, recommendation = self.comparison_agent.generate_alternatives(request)
-        simulations = self.simulation_agent.simulate(request)
-        performance_index = self.performance_agent.calculate(
-            cost,
-            carbon,
-            sustainability["sustainability_score"],
-            risk
+            }
+
+    def finish_result(self, entry, fields, ai_reasoning, degraded=()):
+
+        # Cached results are shared, so each caller gets its own top level
+        result = dict(entry.result)
+
+        if "ai_reasoning" in fields:
+            self.attach_reasoning(result, ai_reasoning)
+
+        if degraded:
+            result.update(self.degraded_marker(degraded))
+
+        return result
+
+    def build_result(self, values, fields=ALL_FIELDS):
+
+        result = {}
+
+        for field in fields:
+
+            # Missing when the deadline cut its agent short
+            if RESULT_FIELDS[field] not in values:
+                continue
+
+            value = values[RESULT_FIELDS[field]]
+
+            if field == "route_path":
+                result[field] = value["path"]
+            elif field == "route_distance_km":
+                result[field] = value["distance_km"]
+            elif field in ("estimated_cost", "carbon_impact"):
+                result[field] = round(value, 2)
+            elif field == "optimization_confidence_score":
+                # Optimization Confidence Score
+                confidence_score = 100 - abs(value["sustainability_score"] - 75)
+                result[field] = max(50, round(confidence_score))
+            elif field in ("sustainability_score", "eco_recommendation", "emission_category"):
+                result[field] = value[field]
+            else:
+                result[field] = value
+
+        return result
+
+
+    def optimize_batch(self, requests, include_reasoning=False, fields=None):
+
+        # AI reasoning is a per-shipment model call, so it is opt-in here
+        if fields is None:
+            fields = [field for field in ALL_FIELDS if include_reasoning or field != "ai_reasoning"]
+
+        fields = self.select_fields(fields)
+
+        # Same latency budget as a single optimize call
+        deadline = self.deadline()
+
+        # Same dependencies as the per-request graph
+        needed = self.graph.required(self.graph_targets(fields))
+
+        batch = RouteBatch(requests)
+
+        if len(batch) == 0:
+            return []
+
+        # Still one result per request, as optimize returns {} for no fields
+        if not fields:
+            return [{} for _ in range(len(batch))]
+
+        # Step 1: Base Calculations (one column per agent)
+        if "route" in needed:
+            route_plans = self.route_agent.plan_batch(batch)
+
+            # Rows on the same lane share its plan, and its route string
+            joined = {}
+            routes = [
+                joined.get(id(plan)) or joined.setdefault(id(plan), " → ".join(plan["path"]))
+                for plan in route_plans
+            ]
+
+        if "risk" in needed:
+            risk = self.risk_agent.analyze_batch(batch)
+
+        # Step 2: Agent Collaboration Logic (same rules as optimize)
+        if "cost" in needed:
+            cost = self.cost_agent.calculate_batch(batch)
+            carbon = self.carbon_agent.calculate_batch(batch)
+
+            cost = np.where(batch.high_priority, cost * 1.1, cost)
+            carbon = np.where(batch.cargo_weight > 200, carbon * 1.2, carbon)
+            carbon = np.where(risk == "Elevated", carbon * 1.1, carbon)
+
+            rounded_cost = round_values(cost).tolist()
+            rounded_carbon = round_values(carbon).tolist()
+
+        if "sustainability" in needed:
+            sustainability = self.sustainability_agent.evaluate_batch(
+                carbon, batch.cargo_weight
+            )
+            scores = sustainability["sustainability_score"]
+
+        columns = []
+
+        for field in fields:
+
+            if field == "optimized_route":
+                column = routes
+            elif field == "route_path":
+                column = [plan["path"] for plan in route_plans]
+            elif field == "route_distance_km":
+                column = [plan["distance_km"] for plan in route_plans]
+            elif field == "estimated_cost":
+                column = rounded_cost
+            elif field == "carbon_impact":
+                column = rounded_carbon
+            elif field == "risk_level":
+                column = risk.tolist()
+            elif field in ("sustainability_score", "eco_recommendation", "emission_category"):
+                column = sustainability[field].tolist()
+            elif field == "optimization_confidence_score":
+                column = np.maximum(50, 100 - np.abs(scores - 75)).tolist()
+            elif field == "decision_explanation":
+                column = self.explanation_agent.generate_batch(routes, cost, carbon, risk, scores)
+            elif field == "ai_reasoning":
+                # One model call per row, fanned out on the graph executor;
+                # rows still waiting at the deadline go without
+                futures = [
+                    self.executor.submit(self.ai_service.generate_reasoning, {
+                        "route": route,
+                        "cost": row_cost,
+                        "carbon": row_carbon,
+                        "risk": row_risk,
+                        "score": score
+                    })
+                    for route, row_cost, row_carbon, row_risk, score in zip(
+                        routes, rounded_cost, rounded_carbon, risk.tolist(), scores.tolist()
+                    )
+                ]
+                reasoning = []
+                for future in futures:
+                    try:
+                        reasoning.append(future.result(timeout=time_left(deadline)))
+                    except TimeoutError:
+                        future.cancel()
+                        reasoning.append(None)
+                column = [self.attach_reasoning({}, text)["ai_reasoning"] for text in reasoning]
+            elif field == "alternative_routes":
+                column, recommendations = self.comparison_agent.generate_alternatives_batch(batch)
+            elif field == "recommended_strategy":
+                if "alternative_routes" not in fields:
+                    _, recommendations = self.comparison_agent.generate_alternatives_batch(batch)
+                column = recommendations
+            elif field == "simulation_analysis":
+                column = self.simulation_agent.simulate_batch(batch)
+            else:
+                column = self.performance_agent.calculate_batch(cost, carbon, scores, risk).tolist()
+
+            columns.append(column)
+
+        rows = [dict(zip(fields, row)) for row in zip(*columns)]
+
+        # Marked like optimize when reasoning did not come back
+        if "ai_reasoning" in fields:
+            for row, text in zip(rows, reasoning):
+                if not text:
+                    row.update(self.degraded_marker(self.degraded_fields(("ai_reasoning",), {"ai_reasoning": text})))
+
+        return rows
+
+
+    def consolidate(self, requests, vehicle_capacities, time_budget=0.5):
+        return self.metrics.call(
+            "Vehicle Routing Agent", self.vehicle_routing_agent.consolidate,
+            requests, vehicle_capacities, time_budget
         )
 
+    def simulate_uncertainty(self, request, **options):
 
-        # Optimization Confidence Score
-        confidence_score = 100 - abs(sustainability["sustainability_score"] - 75)
+        # Sampled around the same cost and carbon /optimize-route reports,
+        # collaboration rules included
+        cost, carbon = self.collaborate(
+            request,
+            self.cost_agent.calculate(request),
+            self.carbon_agent.calculate(request),
+            self.risk_agent.analyze(request)
+        )
 
-        return {
-            "optimized_route": route,
-            "estimated_cost": round(cost, 2),
-            "carbon_impact": round(carbon, 2),
-            "risk_level": risk,
-            **sustainability,
-            "optimization_confidence_score": max(50, round(confidence_score)),
-            "decision_explanation": explanation,
-            "ai_reasoning": ai_reasoning if ai_reasoning else "AI reasoning temporarily unavailable",
-            "alternative_routes": alternatives,
-            "recommended_strategy": recommendation,
-            "simulation_analysis": simulations,
-            "overall_performance_index": performance_index
-
-        }
+        return self.metrics.call(
+            "Uncertainty Simulation",
+            lambda: self.simulation_agent.simulate_uncertainty(request, cost, carbon, **options)
+        )
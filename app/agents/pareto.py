@@ -0,0 +1,42 @@
+import bisect
+
+import numpy as np
+
+
+def pareto_front(cost, carbon, hours):
+
+    # Non-dominated candidates for minimizing (cost, carbon, hours) in
+    # O(n log n): sweep by cost and keep the (carbon, hours) staircase of
+    # everything seen so far. A candidate is dominated if some earlier
+    # one has carbon <= and hours <= it. Exact duplicates keep the first.
+    order = np.lexsort((hours, carbon, cost)).tolist()
+
+    carbon = carbon.tolist()
+    hours = hours.tolist()
+
+    stair_carbon = []
+    stair_hours = []
+    front = []
+
+    for i in order:
+
+        c, h = carbon[i], hours[i]
+
+        # Staircase hours fall as carbon rises, so the last step at or
+        # below c has the fewest hours among those with carbon <= c
+        position = bisect.bisect_right(stair_carbon, c)
+
+        if position and stair_hours[position - 1] <= h:
+            continue
+
+        front.append(i)
+
+        # Drop steps the new point now dominates, then insert it
+        end = position
+        while end < len(stair_carbon) and stair_hours[end] >= h:
+            end += 1
+
+        stair_carbon[position:end] = [c]
+        stair_hours[position:end] = [h]
+
+    return front
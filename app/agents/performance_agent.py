@@ -1,3 +1,8 @@
+import numpy as np
+
+from .batch import round_scores
+
+
 class PerformanceAgent:
 
     def calculate(self, cost, carbon, sustainability_score, risk):
@@ -25,3 +30,22 @@ class PerformanceAgent:
         )
 
         return round(max(0, overall_score))
+
+    def calculate_batch(self, cost, carbon, sustainability_score, risk):
+
+        cost_score = np.maximum(0, 100 - (cost / 10))
+
+        carbon_score = np.maximum(0, 100 - (carbon * 0.3))
+
+        risk_penalty = np.select(
+            [risk == "Elevated", risk == "Medium"], [20, 10], 0
+        )
+
+        overall_score = (
+            (sustainability_score * 0.4) +
+            (cost_score * 0.2) +
+            (carbon_score * 0.2) +
+            (100 - risk_penalty) * 0.2
+        )
+
+        return round_scores(np.maximum(0, overall_score))
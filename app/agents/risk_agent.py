@@ -1,3 +1,6 @@
+from .batch import choose
+
+
 class RiskAgent:
 
     def analyze(self, request):
@@ -7,3 +10,10 @@ class RiskAgent:
             return "Medium"
         else:
             return "Low"
+
+    def analyze_batch(self, batch):
+        return choose(
+            [batch.high_priority, batch.cargo_weight > 200],
+            ["Elevated", "Medium"],
+            "Low"
+        )
@@ -1,7 +1,44 @@
+from .route_engine import RouteEngine, LOCAL_DISTANCE_KM
+
+
 class RouteAgent:
 
+    def __init__(self, engine=None):
+        self.engine = engine or RouteEngine.default()
+
     def get_route(self, request):
-        return f"{request.source} → {request.destination}"
+        return " → ".join(self.plan(request)["path"])
+
+    def plan(self, request):
+
+        found = self.engine.shortest_path(request.source, request.destination)
+
+        # Cities outside the lane graph keep the direct source → destination route
+        if found is None:
+            return {"path": [request.source, request.destination], "distance_km": None}
+
+        path, distance = found
+
+        # Same city: the local leg cost and carbon are priced over
+        if len(path) < 2:
+            path = [request.source, request.destination]
+            distance = LOCAL_DISTANCE_KM
+
+        return {"path": path, "distance_km": distance}
+
+    def plan_batch(self, batch):
+
+        plans = {}
+
+        for request in batch.requests:
+            key = (request.source, request.destination)
+            if key not in plans:
+                plans[key] = self.plan(request)
+
+        return [
+            plans[(source, destination)]
+            for source, destination in zip(batch.sources, batch.destinations)
+        ]
 
 
 def optimize_route(request):
@@ -0,0 +1,273 @@
+import heapq
+import json
+import math
+import os
+
+import numpy as np
+
+
+DEFAULT_GRAPH_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "hub_network.json")
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Agent rates are quoted per kg over this reference lane, so 2.5 per kg
+# means 2.5 per tonne-km. Lanes the graph cannot price use it as-is.
+REFERENCE_DISTANCE_KM = 1000.0
+
+# Pickup and drop within one city still moves the cargo
+LOCAL_DISTANCE_KM = 50.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+
+    h = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+class RouteEngine:
+
+    _default = None
+
+    def __init__(self, nodes, edges, hubs=None, ports=None):
+
+        # nodes: {name: (lat, lon)}, edges: [(a, b, distance_km)], undirected.
+        # ports: nodes with a coastal shipping terminal.
+        self.names = list(nodes)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.coords = [nodes[name] for name in self.names]
+
+        self.adjacency = [[] for _ in self.names]
+
+        # Scale for the A* heuristic so it never overestimates: the
+        # smallest ratio of lane length to great-circle distance.
+        self.heuristic_scale = 1.0
+
+        for a, b, distance in edges:
+
+            i, j = self.index[a], self.index[b]
+            self.adjacency[i].append((j, distance))
+            self.adjacency[j].append((i, distance))
+
+            straight = haversine_km(*self.coords[i], *self.coords[j])
+            if straight > 0:
+                self.heuristic_scale = min(self.heuristic_scale, distance / straight)
+
+        self.hubs = list(hubs) if hubs else list(self.names)
+        self.hub_index = {name: h for h, name in enumerate(self.hubs)}
+        self.ports = set(ports or ())
+
+        self._lane_memo = {}
+
+        self._precompute_hubs()
+
+        # lane_factors[source][destination]: every hub pair up front, other
+        # graph lanes once they are asked for. Cities outside the graph are
+        # never added, so it stays bounded. Nested rather than keyed by
+        # tuple so a lookup does not build and hash a key.
+        self.lane_factors = {
+            source: {
+                destination: self.lane_distance(source, destination) / REFERENCE_DISTANCE_KM
+                for destination in self.hubs
+            }
+            for source in self.hubs
+        }
+
+    @classmethod
+    def from_file(cls, path):
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        nodes = {name: (node["lat"], node["lon"]) for name, node in data["nodes"].items()}
+        edges = [(edge["from"], edge["to"], float(edge["distance_km"])) for edge in data["edges"]]
+
+        return cls(nodes, edges, data.get("hubs"), data.get("ports"))
+
+    @classmethod
+    def default(cls):
+
+        # Loaded once per process and shared by every RouteAgent
+        if cls._default is None:
+            cls._default = cls.from_file(os.getenv("ROUTE_GRAPH_PATH", DEFAULT_GRAPH_PATH))
+
+        return cls._default
+
+    def _precompute_hubs(self):
+
+        hub_count = len(self.hubs)
+
+        # hub_distance[a, b]: shortest distance between hubs a and b.
+        # next_hop[b, v]: next node on the shortest path from v towards
+        # hub b, i.e. the predecessor of v in the tree rooted at b.
+        self.hub_distance = np.full((hub_count, hub_count), np.inf, dtype=np.float32)
+        self.next_hop = np.full((hub_count, len(self.names)), -1, dtype=np.int32)
+
+        hub_nodes = [self.index[name] for name in self.hubs]
+
+        for h, node in enumerate(hub_nodes):
+
+            distance, previous = self._dijkstra(node)
+
+            self.hub_distance[h] = [distance[other] for other in hub_nodes]
+            self.next_hop[h] = previous
+
+    def _dijkstra(self, source):
+
+        distance = [math.inf] * len(self.names)
+        previous = [-1] * len(self.names)
+        distance[source] = 0.0
+
+        heap = [(0.0, source)]
+
+        while heap:
+
+            d, node = heapq.heappop(heap)
+
+            if d > distance[node]:
+                continue
+
+            for neighbour, weight in self.adjacency[node]:
+                candidate = d + weight
+                if candidate < distance[neighbour]:
+                    distance[neighbour] = candidate
+                    previous[neighbour] = node
+                    heapq.heappush(heap, (candidate, neighbour))
+
+        return distance, previous
+
+    def _astar(self, source, target):
+
+        target_coords = self.coords[target]
+
+        def heuristic(node):
+            return haversine_km(*self.coords[node], *target_coords) * self.heuristic_scale
+
+        distance = {source: 0.0}
+        previous = {source: -1}
+        heap = [(heuristic(source), 0.0, source)]
+
+        while heap:
+
+            _, d, node = heapq.heappop(heap)
+
+            if node == target:
+                path = [node]
+                while previous[path[-1]] != -1:
+                    path.append(previous[path[-1]])
+                return path[::-1], d
+
+            if d > distance[node]:
+                continue
+
+            for neighbour, weight in self.adjacency[node]:
+                candidate = d + weight
+                if candidate < distance.get(neighbour, math.inf):
+                    distance[neighbour] = candidate
+                    previous[neighbour] = node
+                    heapq.heappush(heap, (candidate + heuristic(neighbour), candidate, neighbour))
+
+        return None
+
+    def shortest_path(self, source, destination):
+
+        # Returns (path, distance_km), or None if unknown or unreachable
+        if source not in self.index or destination not in self.index:
+            return None
+
+        a = self.hub_index.get(source)
+        b = self.hub_index.get(destination)
+
+        if a is None or b is None:
+            found = self._astar(self.index[source], self.index[destination])
+            if found is None:
+                return None
+            path, distance = found
+            return [self.names[node] for node in path], round(distance, 1)
+
+        distance = self.hub_distance[a, b]
+
+        if not np.isfinite(distance):
+            return None
+
+        # Walk the precomputed next hops towards the destination hub
+        node = self.index[source]
+        target = self.index[destination]
+        hops = self.next_hop[b]
+        path = [source]
+
+        while node != target:
+            node = int(hops[node])
+            path.append(self.names[node])
+
+        return path, round(float(distance), 1)
+
+    def lane_distance(self, source, destination):
+
+        a = self.hub_index.get(source)
+        b = self.hub_index.get(destination)
+
+        if a is not None and b is not None:
+            if a == b:
+                return LOCAL_DISTANCE_KM
+            distance = self.hub_distance.item(a, b)
+            return distance if math.isfinite(distance) else REFERENCE_DISTANCE_KM
+
+        if source not in self.index or destination not in self.index:
+            return REFERENCE_DISTANCE_KM
+
+        # Non-hub lanes are solved once and remembered
+        key = (source, destination)
+        distance = self._lane_memo.get(key)
+
+        if distance is None:
+            if source == destination:
+                distance = LOCAL_DISTANCE_KM
+            else:
+                found = self.shortest_path(source, destination)
+                distance = found[1] if found else REFERENCE_DISTANCE_KM
+            self._lane_memo[key] = distance
+
+        return distance
+
+    def great_circle_km(self, source, destination):
+
+        if source not in self.index or destination not in self.index:
+            return None
+
+        return haversine_km(*self.coords[self.index[source]], *self.coords[self.index[destination]])
+
+    def lane_factor(self, source, destination):
+
+        factors = self.lane_factors.get(source)
+        factor = factors.get(destination) if factors is not None else None
+
+        if factor is None:
+            factor = self.lane_distance(source, destination) / REFERENCE_DISTANCE_KM
+            if source in self.index and destination in self.index:
+                self.lane_factors.setdefault(source, {})[destination] = factor
+
+        return factor
+
+    def lane_factor_batch(self, sources, destinations):
+
+        size = len(sources)
+        a = np.fromiter((self.hub_index.get(s, -1) for s in sources), dtype=np.int64, count=size)
+        b = np.fromiter((self.hub_index.get(d, -1) for d in destinations), dtype=np.int64, count=size)
+
+        distance = np.full(size, REFERENCE_DISTANCE_KM)
+        hubs = (a >= 0) & (b >= 0)
+
+        distance[hubs] = self.hub_distance[a[hubs], b[hubs]]
+        distance[hubs & (a == b)] = LOCAL_DISTANCE_KM
+        distance[~np.isfinite(distance)] = REFERENCE_DISTANCE_KM
+
+        for i in np.flatnonzero(~hubs).tolist():
+            distance[i] = self.lane_distance(sources[i], destinations[i])
+
+        return distance / REFERENCE_DISTANCE_KM
@@ -1,28 +1,193 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch import round_values, round_scores
+from .models.route_models import SimulationScenario
+from .route_engine import RouteEngine
+from .sustainability_agent import SustainabilityAgent
+
+
+# Above this many samples the uncertainty mode may split across processes
+PARALLEL_SAMPLE_THRESHOLD = 2_000_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def sample_outcomes(base_cost, base_carbon, delay_probability, size, seed):
+
+    rng = np.random.default_rng(seed)
+
+    # Fuel is roughly 40% of lane cost; its price moves log-normally
+    fuel_price = rng.lognormal(mean=0.0, sigma=0.15, size=size)
+
+    # Emptier vehicles spread the same trip over less cargo; the mode
+    # sits at a typical 70% load and the mean is two thirds
+    load_factor = rng.triangular(0.3, 0.7, 1.0, size=size)
+    load_penalty = (2 / 3) / load_factor
+
+    # Delays add a surcharge and idling emissions
+    delayed = rng.random(size) < delay_probability
+
+    emission_factor = np.clip(rng.normal(1.0, 0.1, size=size), 0.5, None)
+
+    cost = base_cost * (0.6 + 0.4 * fuel_price) * load_penalty * np.where(delayed, 1.15, 1.0)
+    carbon = base_carbon * emission_factor * load_penalty * np.where(delayed, 1.05, 1.0)
+
+    return cost, carbon
+
+
 class SimulationAgent:
 
+    def __init__(self, engine=None, sustainability_agent=None):
+        self.engine = engine or RouteEngine.default()
+
+        # Scores uncertainty samples the way /optimize-route scores a result
+        self.sustainability_agent = sustainability_agent or SustainabilityAgent()
+
+        # Worker processes for very large uncertainty runs, started on
+        # first use and kept. Spawned rather than forked: the server is
+        # threaded, and a fork copies whatever locks other threads hold.
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
     def simulate(self, request):
 
+        lane_factor = self.engine.lane_factor(request.source, request.destination)
+
         # Scenario 1: Reduce cargo by 10%
         reduced_weight = request.cargo_weight * 0.9
-        reduced_carbon = reduced_weight * 0.8
-        reduced_cost = reduced_weight * 2.5
-
-        scenario_1 = {
-            "scenario": "Reduce cargo weight by 10%",
-            "estimated_cost": round(reduced_cost, 2),
-            "carbon_impact": round(reduced_carbon, 2),
-            "sustainability_score": max(0, round(100 - (reduced_carbon * 0.5)))
-        }
+        reduced_carbon = reduced_weight * 0.8 * lane_factor
+        reduced_cost = reduced_weight * 2.5 * lane_factor
+
+        scenario_1 = SimulationScenario(
+            scenario="Reduce cargo weight by 10%",
+            estimated_cost=round(reduced_cost, 2),
+            carbon_impact=round(reduced_carbon, 2),
+            sustainability_score=max(0, round(100 - (reduced_carbon * 0.5)))
+        )
 
         # Scenario 2: Change priority to Low
-        low_priority_cost = request.cargo_weight * 2.3
-        low_priority_carbon = request.cargo_weight * 0.7
-
-        scenario_2 = {
-            "scenario": "Switch to Low Priority Delivery",
-            "estimated_cost": round(low_priority_cost, 2),
-            "carbon_impact": round(low_priority_carbon, 2),
-            "sustainability_score": max(0, round(100 - (low_priority_carbon * 0.5)))
-        }
+        low_priority_cost = request.cargo_weight * 2.3 * lane_factor
+        low_priority_carbon = request.cargo_weight * 0.7 * lane_factor
+
+        scenario_2 = SimulationScenario(
+            scenario="Switch to Low Priority Delivery",
+            estimated_cost=round(low_priority_cost, 2),
+            carbon_impact=round(low_priority_carbon, 2),
+            sustainability_score=max(0, round(100 - (low_priority_carbon * 0.5)))
+        )
 
         return [scenario_1, scenario_2]
+
+    def simulate_batch(self, batch):
+
+        weight = batch.cargo_weight
+        lane_factor = self.engine.lane_factor_batch(batch.sources, batch.destinations)
+
+        reduced_weight = weight * 0.9
+        reduced_carbon = reduced_weight * 0.8 * lane_factor
+        reduced_cost = reduced_weight * 2.5 * lane_factor
+        reduced_score = np.maximum(0, round_scores(100 - (reduced_carbon * 0.5)))
+
+        low_priority_cost = weight * 2.3 * lane_factor
+        low_priority_carbon = weight * 0.7 * lane_factor
+        low_priority_score = np.maximum(0, round_scores(100 - (low_priority_carbon * 0.5)))
+
+        return [
+            [
+                SimulationScenario("Reduce cargo weight by 10%", r_cost, r_carbon, r_score),
+                SimulationScenario("Switch to Low Priority Delivery", l_cost, l_carbon, l_score)
+            ]
+            for r_cost, r_carbon, r_score, l_cost, l_carbon, l_score in zip(
+                round_values(reduced_cost).tolist(),
+                round_values(reduced_carbon).tolist(),
+                reduced_score.tolist(),
+                round_values(low_priority_cost).tolist(),
+                round_values(low_priority_carbon).tolist(),
+                low_priority_score.tolist()
+            )
+        ]
+
+    def simulate_uncertainty(
+        self,
+        request,
+        base_cost,
+        base_carbon,
+        samples=10_000,
+        cost_threshold=None,
+        carbon_threshold=None,
+        seed=None,
+        workers=None
+    ):
+
+        # base_cost and base_carbon are the point estimates the samples
+        # vary around, i.e. the /optimize-route figures for the request
+        delay_probability = 0.2 if request.priority.lower() == "high" else 0.1
+
+        seeds = np.random.SeedSequence(seed)
+        workers = workers or int(os.getenv("SIMULATION_WORKERS", "1"))
+
+        if workers > 1 and samples >= PARALLEL_SAMPLE_THRESHOLD:
+
+            sizes = [samples // workers + (1 if i < samples % workers else 0) for i in range(workers)]
+
+            chunks = list(self.sampling_pool(workers).map(
+                sample_outcomes,
+                [base_cost] * workers,
+                [base_carbon] * workers,
+                [delay_probability] * workers,
+                sizes,
+                seeds.spawn(workers)
+            ))
+
+            cost = np.concatenate([chunk[0] for chunk in chunks])
+            carbon = np.concatenate([chunk[1] for chunk in chunks])
+
+        else:
+            cost, carbon = sample_outcomes(base_cost, base_carbon, delay_probability, samples, seeds)
+
+        sustainability = self.sustainability_agent.evaluate_batch(
+            carbon, np.full(samples, float(request.cargo_weight))
+        )
+        score = sustainability["sustainability_score"]
+
+        def distribution(values):
+            points = np.percentile(values, PERCENTILES)
+            return {
+                "mean": round(float(values.mean()), 2),
+                **{f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, points)}
+            }
+
+        breach_probability = {
+            "high_emission": round(float((sustainability["emission_category"] == "High Emission").mean()), 4)
+        }
+
+        if cost_threshold is not None:
+            breach_probability["cost"] = round(float((cost > cost_threshold).mean()), 4)
+
+        if carbon_threshold is not None:
+            breach_probability["carbon"] = round(float((carbon > carbon_threshold).mean()), 4)
+
+        return {
+            "samples": samples,
+            "estimated_cost": distribution(cost),
+            "carbon_impact": distribution(carbon),
+            "sustainability_score": distribution(score),
+            "breach_probability": breach_probability
+        }
+
+    def sampling_pool(self, workers):
+
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=min(workers, os.cpu_count() or 1),
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+
+        return self._pool
@@ -1,3 +1,8 @@
+import numpy as np
+
+from .batch import choose, round_scores
+
+
 class SustainabilityAgent:
 
     def evaluate(self, carbon_impact, cargo_weight):
@@ -25,3 +30,31 @@ class SustainabilityAgent:
             "eco_recommendation": recommendation,
             "emission_category": emission_category
         }
+
+    def evaluate_batch(self, carbon_impact, cargo_weight):
+
+        carbon_score = np.maximum(0, 100 - (carbon_impact * 0.5))
+
+        weight_factor = np.minimum(cargo_weight / 500, 1) * 20
+
+        score = np.maximum(0, round_scores(carbon_score - weight_factor))
+
+        highly = score > 75
+        moderately = score > 40
+
+        recommendation = choose(
+            [highly, moderately],
+            ["Highly Sustainable Route 🌱", "Moderately Sustainable Route"],
+            "High Emission Route ⚠"
+        )
+        emission_category = choose(
+            [highly, moderately],
+            ["Low Emission", "Medium Emission"],
+            "High Emission"
+        )
+
+        return {
+            "sustainability_score": score,
+            "eco_recommendation": recommendation,
+            "emission_category": emission_category
+        }
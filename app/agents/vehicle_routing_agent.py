@@ -0,0 +1,177 @@
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from .route_engine import RouteEngine
+from .vrp_solver import route_length, solve_cvrp
+
+
+# A vehicle running empty still costs and emits this share of a full one,
+# which is what makes putting several shipments on one vehicle pay off.
+EMPTY_RUNNING_SHARE = 0.65
+
+
+class VehicleRoutingAgent:
+
+    def __init__(self, cost_agent, carbon_agent, sustainability_agent, engine=None):
+        self.engine = engine or RouteEngine.default()
+        self.cost_agent = cost_agent
+        self.carbon_agent = carbon_agent
+        self.sustainability_agent = sustainability_agent
+
+    def consolidate(self, requests, vehicle_capacities, time_budget=0.5):
+
+        started = time.perf_counter()
+
+        requests = list(requests)
+        largest_vehicle = max(vehicle_capacities, default=0)
+
+        # Shipments that leave from the same city share a depot
+        depots = defaultdict(list)
+        unassigned = []
+
+        for index, request in enumerate(requests):
+            if request.cargo_weight > largest_vehicle:
+                unassigned.append(index)
+            else:
+                depots[request.source].append(index)
+
+        free_vehicles = sorted(enumerate(vehicle_capacities), key=lambda vehicle: vehicle[1])
+        tours = []
+
+        # Plan against the largest free vehicle, then best fit: heaviest
+        # tour first, onto the smallest vehicle that holds it. Tours that
+        # no free vehicle holds go back to their depot and are planned
+        # again against the largest vehicle left, so a mixed fleet is used
+        # before anything is left behind.
+        while depots and free_vehicles:
+
+            capacity = free_vehicles[-1][1]
+
+            for source, shipments in depots.items():
+                unassigned.extend(i for i in shipments if requests[i].cargo_weight > capacity)
+                shipments[:] = [i for i in shipments if requests[i].cargo_weight <= capacity]
+
+            depots = {source: shipments for source, shipments in depots.items() if shipments}
+            pending = sum(len(shipments) for shipments in depots.values())
+            remaining = max(0.0, time_budget - (time.perf_counter() - started))
+            planned = []
+
+            for source, shipments in depots.items():
+
+                # Split the time budget by the share of stops at each depot
+                budget = remaining * len(shipments) / pending
+
+                distance = self.stop_distances(source, [requests[i].destination for i in shipments])
+                demands = [0.0] + [requests[i].cargo_weight for i in shipments]
+
+                for route in solve_cvrp(distance, demands, capacity, budget):
+                    planned.append((source, [shipments[c - 1] for c in route], route, distance))
+
+            depots = defaultdict(list)
+
+            for source, shipments, route, distance in sorted(
+                planned, key=lambda tour: -sum(requests[i].cargo_weight for i in tour[1])
+            ):
+                load = sum(requests[i].cargo_weight for i in shipments)
+                fit = next((v for v in free_vehicles if v[1] >= load), None)
+
+                if fit is None:
+                    depots[source].extend(shipments)
+                    continue
+
+                free_vehicles.remove(fit)
+                tours.append(self.score_tour(fit, source, shipments, route, distance, requests))
+
+        unassigned.extend(index for shipments in depots.values() for index in shipments)
+
+        tours.sort(key=lambda tour: tour["vehicle"])
+
+        # Baseline: every planned shipment on its own vehicle, out and back
+        planned_shipments = [index for tour in tours for index in tour["shipments"]]
+        dedicated = [
+            self.score_tour(
+                (None, min(c for c in vehicle_capacities if c >= requests[index].cargo_weight)),
+                requests[index].source,
+                [index],
+                [1],
+                self.stop_distances(requests[index].source, [requests[index].destination]),
+                requests
+            )
+            for index in planned_shipments
+        ]
+        unconsolidated_cost = sum(t["estimated_cost"] for t in dedicated)
+        unconsolidated_carbon = sum(t["carbon_impact"] for t in dedicated)
+
+        return {
+            "tours": tours,
+            "unassigned_shipments": sorted(unassigned),
+            "total_cost": round(sum(t["estimated_cost"] for t in tours), 2),
+            "total_carbon": round(sum(t["carbon_impact"] for t in tours), 2),
+            "unconsolidated_cost": round(unconsolidated_cost, 2),
+            "unconsolidated_carbon": round(unconsolidated_carbon, 2),
+            "solve_time_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    def stop_distances(self, source, destinations):
+
+        # Stops in the same city are zero apart; the depot leg uses the lane
+        cities = sorted(set(destinations))
+        city_index = {city: i for i, city in enumerate(cities)}
+
+        city_distance = np.array([
+            [0.0 if a == b else self.engine.lane_distance(a, b) for b in cities]
+            for a in cities
+        ])
+
+        stops = np.array([city_index[city] for city in destinations])
+
+        distance = np.zeros((len(destinations) + 1, len(destinations) + 1))
+        distance[1:, 1:] = city_distance[np.ix_(stops, stops)]
+
+        depot_legs = np.array([self.engine.lane_distance(source, city) for city in cities])
+        distance[0, 1:] = depot_legs[stops]
+        distance[1:, 0] = depot_legs[stops]
+
+        return distance
+
+    def score_tour(self, vehicle, source, shipments, route, distance, requests):
+
+        d = distance.tolist()
+        load = sum(requests[i].cargo_weight for i in shipments)
+
+        # Each leg is charged at the tonne-km rate for an equivalent weight:
+        # the full capacity when loaded, EMPTY_RUNNING_SHARE of it when empty.
+        capacity = vehicle[1]
+        cost = 0.0
+        carbon = 0.0
+        on_board = load
+        previous = 0
+
+        for stop, shipment in zip(route + [0], shipments + [None]):
+            equivalent = capacity * EMPTY_RUNNING_SHARE + on_board * (1 - EMPTY_RUNNING_SHARE)
+            cost += self.cost_agent.calculate_leg(equivalent, d[previous][stop])
+            carbon += self.carbon_agent.calculate_leg(equivalent, d[previous][stop])
+            if shipment is not None:
+                on_board -= requests[shipment].cargo_weight
+            previous = stop
+
+        cities = [source]
+        for city in [requests[i].destination for i in shipments] + [source]:
+            if city != cities[-1]:
+                cities.append(city)
+
+        return {
+            "vehicle": vehicle[0],
+            "vehicle_capacity": vehicle[1],
+            "origin": source,
+            "load_kg": round(load, 2),
+            "shipments": shipments,
+            "route": " → ".join(cities),
+            "distance_km": round(route_length(route, d), 1),
+            "estimated_cost": round(cost, 2),
+            "carbon_impact": round(carbon, 2),
+            # Scored as the average shipment on the tour
+            **self.sustainability_agent.evaluate(carbon / len(shipments), load / len(shipments))
+        }
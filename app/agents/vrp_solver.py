@@ -0,0 +1,242 @@
+import time
+
+import numpy as np
+
+
+EPSILON = 1e-9
+
+
+def solve_cvrp(distance, demands, capacity, time_budget=0.5, neighbours=30):
+
+    # distance: symmetric (n + 1) x (n + 1) matrix with the depot at index 0.
+    # demands[0] is the depot. Returns routes as lists of customer indices.
+    deadline = time.perf_counter() + time_budget
+
+    customers = len(demands) - 1
+
+    if customers == 0:
+        return []
+
+    nearest = nearest_neighbours(distance, min(neighbours, customers - 1))
+
+    # Scalar lookups on nested lists are several times faster than on ndarrays
+    d = distance.tolist()
+
+    routes = savings_routes(distance, demands, capacity, nearest)
+
+    improve_routes(routes, d, demands, capacity, nearest, deadline)
+
+    return [route for route in routes if route]
+
+
+def nearest_neighbours(distance, k):
+
+    customer_distance = distance[1:, 1:].copy()
+    np.fill_diagonal(customer_distance, np.inf)
+
+    if k <= 0:
+        return [[] for _ in range(len(distance))]
+
+    nearest = np.argpartition(customer_distance, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(customer_distance, nearest, axis=1).argsort(axis=1)
+    nearest = np.take_along_axis(nearest, order, axis=1) + 1
+
+    # Index 0 is the depot, so neighbour lists are shifted by one
+    return [[]] + nearest.tolist()
+
+
+def savings_routes(distance, demands, capacity, nearest):
+
+    # Clarke-Wright parallel savings, restricted to k-nearest pairs
+    pairs = {
+        (min(i, j), max(i, j))
+        for i in range(1, len(demands))
+        for j in nearest[i]
+    }
+
+    if pairs:
+        pair_array = np.array(sorted(pairs))
+        i, j = pair_array[:, 0], pair_array[:, 1]
+        savings = distance[0, i] + distance[0, j] - distance[i, j]
+        order = np.argsort(-savings, kind="stable")
+        candidates = [
+            (a, b)
+            for a, b, saving in zip(i[order].tolist(), j[order].tolist(), savings[order].tolist())
+            if saving > EPSILON
+        ]
+    else:
+        candidates = []
+
+    routes = {c: [c] for c in range(1, len(demands))}
+    route_of = {c: c for c in routes}
+    load = {c: demands[c] for c in routes}
+
+    for a, b in candidates:
+
+        ra, rb = route_of[a], route_of[b]
+
+        if ra == rb or load[ra] + load[rb] > capacity:
+            continue
+
+        first, second = routes[ra], routes[rb]
+
+        # Both customers must sit at an end of their routes
+        if first[-1] == a and second[0] == b:
+            merged = first + second
+        elif first[0] == a and second[-1] == b:
+            merged = second + first
+        elif first[0] == a and second[0] == b:
+            merged = first[::-1] + second
+        elif first[-1] == a and second[-1] == b:
+            merged = first + second[::-1]
+        else:
+            continue
+
+        # Keep the id of the longer route so fewer customers are relabelled
+        keep, drop = (ra, rb) if len(first) >= len(second) else (rb, ra)
+
+        for customer in routes[drop]:
+            route_of[customer] = keep
+
+        routes[keep] = merged
+        load[keep] = load[ra] + load[rb]
+        del routes[drop]
+        del load[drop]
+
+    return list(routes.values())
+
+
+def route_length(route, d):
+
+    if not route:
+        return 0.0
+
+    total = d[0][route[0]] + d[route[-1]][0]
+
+    for a, b in zip(route, route[1:]):
+        total += d[a][b]
+
+    return total
+
+
+def two_opt(route, d, deadline):
+
+    improved = True
+
+    while improved and time.perf_counter() < deadline:
+
+        improved = False
+        tour = [0] + route + [0]
+
+        for i in range(1, len(tour) - 2):
+
+            a, b = tour[i - 1], tour[i]
+            d_a = d[a]
+
+            for j in range(i + 1, len(tour) - 1):
+
+                c, e = tour[j], tour[j + 1]
+
+                if d_a[c] + d[b][e] - d_a[b] - d[c][e] < -EPSILON:
+                    tour[i:j + 1] = tour[i:j + 1][::-1]
+                    b = tour[i]
+                    improved = True
+
+        route[:] = tour[1:-1]
+
+
+def or_opt(routes, d, demands, capacity, nearest, deadline):
+
+    # Move segments of one to three customers next to a nearby customer,
+    # within the same route or into another route with spare capacity.
+    loads = [sum(demands[c] for c in route) for route in routes]
+
+    where = {}
+    for r, route in enumerate(routes):
+        for p, customer in enumerate(route):
+            where[customer] = (r, p)
+
+    improved = False
+
+    for segment_length in (1, 2, 3):
+
+        for start in range(1, len(demands)):
+
+            if time.perf_counter() >= deadline:
+                return improved
+
+            r, p = where[start]
+            route = routes[r]
+
+            if p + segment_length > len(route):
+                continue
+
+            segment = route[p:p + segment_length]
+            first, last = segment[0], segment[-1]
+            before = route[p - 1] if p > 0 else 0
+            after = route[p + segment_length] if p + segment_length < len(route) else 0
+            segment_demand = sum(demands[c] for c in segment)
+
+            removal_gain = d[before][first] + d[last][after] - d[before][after]
+
+            best = None
+
+            for neighbour in nearest[first]:
+
+                if neighbour in segment:
+                    continue
+
+                target, q = where[neighbour]
+
+                if target != r and loads[target] + segment_demand > capacity:
+                    continue
+
+                target_route = routes[target]
+
+                # Insert right after or right before the neighbour
+                for x, y, position in (
+                    (neighbour, target_route[q + 1] if q + 1 < len(target_route) else 0, q + 1),
+                    (target_route[q - 1] if q > 0 else 0, neighbour, q)
+                ):
+                    if x in segment or y in segment:
+                        continue
+
+                    delta = d[x][first] + d[last][y] - d[x][y] - removal_gain
+
+                    if delta < -EPSILON and (best is None or delta < best[0]):
+                        best = (delta, target, position)
+
+            if best is None:
+                continue
+
+            _, target, position = best
+
+            if target == r:
+                remaining = route[:p] + route[p + segment_length:]
+                if position > p:
+                    position -= segment_length
+                routes[r] = remaining[:position] + segment + remaining[position:]
+            else:
+                routes[r] = route[:p] + route[p + segment_length:]
+                routes[target] = routes[target][:position] + segment + routes[target][position:]
+                loads[r] -= segment_demand
+                loads[target] += segment_demand
+
+            for changed in {r, target}:
+                for q, customer in enumerate(routes[changed]):
+                    where[customer] = (changed, q)
+
+            improved = True
+
+    return improved
+
+
+def improve_routes(routes, d, demands, capacity, nearest, deadline):
+
+    while time.perf_counter() < deadline:
+
+        for route in routes:
+            two_opt(route, d, deadline)
+
+        if not or_opt(routes, d, demands, capacity, nearest, deadline):
+            break
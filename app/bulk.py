@@ -0,0 +1,375 @@
+"""Stream shipments from CSV or JSONL through the orchestrator in bulk.
+
+Rows are read lazily, grouped into chunks and optimized with
+LogisticsOrchestrator.optimize_batch on a pool of worker processes.
+Results are written as each chunk finishes, in the input order, to JSONL,
+CSV or Parquet, so memory depends on the chunk size and the number of
+workers, not on the file size. AI reasoning is a Bedrock call per row and
+stays off unless --with-reasoning is given.
+
+    python -m app.bulk shipments.csv results.jsonl
+    python -m app.bulk shipments.jsonl results.parquet --workers 8 --chunk-size 5000
+    python -m app.bulk shipments.csv - --fields estimated_cost,carbon_impact
+
+Input rows need source, destination, cargo_weight and priority. Each
+output row repeats them, adds the selected result fields, degraded and
+degraded_fields (set when AI reasoning did not come back) and an error
+column that is empty unless the row could not be read.
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic import ValidationError
+
+from app.agents.models.route_models import RouteRequest
+from app.services.json_response import dumps
+
+
+INPUT_FIELDS = ("source", "destination", "cargo_weight", "priority")
+
+# Numeric output columns; Parquet stores them as float64 and every other
+# column (nested values included, as JSON) as text
+NUMERIC_FIELDS = {
+    "cargo_weight", "route_distance_km", "estimated_cost", "carbon_impact", "sustainability_score",
+    "optimization_confidence_score", "overall_performance_index"
+}
+
+# Set on rows whose AI reasoning did not come back, as /optimize-routes does
+DEGRADED_FIELDS = ("degraded", "degraded_fields")
+
+# One orchestrator per worker process, built by init_worker
+worker_orchestrator = None
+worker_include_reasoning = False
+
+
+def detect_format(path, given, choices):
+
+    if given:
+        return given
+
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    extension = {"ndjson": "jsonl", "json": "jsonl", "pq": "parquet"}.get(extension, extension)
+
+    if extension not in choices:
+        raise SystemExit(f"Cannot tell the format of {path}; pass one of {', '.join(choices)}")
+
+    return extension
+
+
+class UnreadableLine(str):
+
+    # Stands in for a JSONL line that is not valid JSON; the text is the
+    # error, so the line still gets its own record
+    pass
+
+
+def read_rows(path, fmt):
+
+    # Yields one dict per input row without loading the file
+    handle = sys.stdin if path == "-" else open(path, newline="" if fmt == "csv" else None, encoding="utf-8")
+
+    try:
+        if fmt == "csv":
+            yield from csv.DictReader(handle)
+        else:
+            for number, line in enumerate(handle, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield UnreadableLine(f"invalid row: line {number} is not valid JSON ({e})")
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def output_columns(fields):
+
+    # Every row has every column, so each chunk of CSV or Parquet output
+    # matches the header and schema written up front
+    return [*INPUT_FIELDS, *fields, *DEGRADED_FIELDS, "error"]
+
+
+def chunked(rows, size):
+
+    rows = iter(rows)
+
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def init_worker(include_reasoning):
+
+    global worker_orchestrator, worker_include_reasoning
+
+    from app.agents.orchestrator import LogisticsOrchestrator
+
+    worker_orchestrator = LogisticsOrchestrator()
+    worker_include_reasoning = include_reasoning
+
+    # Offline runs wait for every reasoning call instead of cutting them
+    # off at the interactive latency budget
+    worker_orchestrator.deadline_seconds = 0
+
+
+def process_chunk(rows, fields, fmt):
+
+    # Optimizes one chunk and returns it already encoded for the writer:
+    # text for JSONL and CSV, columns for Parquet
+    requests, parsed = [], []
+
+    for row in rows:
+
+        if isinstance(row, UnreadableLine):
+            parsed.append((None, str(row)))
+            continue
+        if not isinstance(row, dict):
+            parsed.append((None, "invalid row: expected a JSON object"))
+            continue
+
+        try:
+            request = RouteRequest(**{field: row.get(field) for field in INPUT_FIELDS})
+            requests.append(request)
+            parsed.append((request, None))
+        except ValidationError as e:
+            parsed.append((None, "invalid row: " + "; ".join(
+                f"{'.'.join(map(str, error['loc']))} {error['msg']}" for error in e.errors()
+            )))
+
+    results = iter(worker_orchestrator.optimize_batch(
+        requests, include_reasoning=worker_include_reasoning, fields=fields
+    ))
+
+    records = []
+
+    for row, (request, error) in zip(rows, parsed):
+
+        if error is None:
+            record = {field: getattr(request, field) for field in INPUT_FIELDS}
+            record.update(next(results))
+            record.setdefault("degraded", False)
+            record.setdefault("degraded_fields", None)
+        else:
+            # Echo what was given, typed like the output column
+            row = row if isinstance(row, dict) else {}
+            record = {field: echo_value(field, row.get(field)) for field in INPUT_FIELDS}
+            record.update(dict.fromkeys((*fields, *DEGRADED_FIELDS)))
+
+        record["error"] = error
+        records.append(record)
+
+    columns = output_columns(fields)
+    records = [{column: record[column] for column in columns} for record in records]
+
+    if fmt == "jsonl":
+        return "".join(dumps(record).decode("utf-8") + "\n" for record in records)
+
+    # CSV and Parquet keep a flat schema: nested values become JSON text
+    flat = [
+        {key: dumps(value).decode("utf-8") if isinstance(value, (dict, list)) else value for key, value in record.items()}
+        for record in records
+    ]
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n").writerows(flat)
+        return buffer.getvalue()
+
+    return {column: [record[column] for record in flat] for column in columns}
+
+
+def echo_value(field, value):
+
+    # Numeric columns get a float or nothing, every other column text, so
+    # a bad row always fits the Parquet schema
+    if value is None or value == "":
+        return None
+
+    if field in NUMERIC_FIELDS:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        try:
+            return float(value)
+        except OverflowError:
+            return None
+
+    return value if isinstance(value, str) else dumps(value).decode("utf-8")
+
+
+class OutputWriter:
+
+    def __init__(self, path, fmt, columns):
+
+        self.fmt = fmt
+
+        if fmt == "parquet":
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+
+            self.pyarrow = pyarrow
+            self.schema = pyarrow.schema([
+                (
+                    column,
+                    pyarrow.float64() if column in NUMERIC_FIELDS
+                    else pyarrow.bool_() if column == "degraded"
+                    else pyarrow.string()
+                )
+                for column in columns
+            ])
+            self.parquet = pyarrow.parquet.ParquetWriter(path, self.schema)
+            return
+
+        self.handle = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+
+        if fmt == "csv":
+            csv.writer(self.handle, lineterminator="\n").writerow(columns)
+
+    def write(self, encoded):
+
+        if self.fmt != "parquet":
+            self.handle.write(encoded)
+            return
+
+        self.parquet.write_table(self.pyarrow.table(encoded, schema=self.schema))
+
+    def close(self):
+
+        if self.fmt == "parquet":
+            self.parquet.close()
+            return
+
+        if self.handle is not sys.stdout:
+            self.handle.close()
+        else:
+            self.handle.flush()
+
+
+def run(rows, writer, fields, fmt, workers, chunk_size, include_reasoning, progress):
+
+    # At most two chunks per worker are in flight, so a slow writer or a
+    # huge file never piles results up in memory
+    start = time.perf_counter()
+    last_report = start
+    done = 0
+
+    def report(final=False):
+        elapsed = time.perf_counter() - start
+        rate = done / elapsed if elapsed else 0.0
+        label = "done" if final else "progress"
+        print(f"{label}: {done} rows in {elapsed:.1f} s ({rate:,.0f} rows/s)", file=sys.stderr)
+
+    if workers <= 1:
+        init_worker(include_reasoning)
+        results = ((process_chunk(chunk, fields, fmt), len(chunk)) for chunk in chunked(rows, chunk_size))
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(include_reasoning,))
+        results = ordered_results(pool, chunked(rows, chunk_size), fields, fmt, workers * 2)
+
+    try:
+        for encoded, size in results:
+            writer.write(encoded)
+            done += size
+
+            if progress and time.perf_counter() - last_report >= progress:
+                last_report = time.perf_counter()
+                report()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    report(final=True)
+
+    return done
+
+
+def ordered_results(pool, chunks, fields, fmt, window):
+
+    pending = deque()
+
+    for chunk in chunks:
+        pending.append((pool.submit(process_chunk, chunk, fields, fmt), len(chunk)))
+
+        if len(pending) >= window:
+            future, size = pending.popleft()
+            yield future.result(), size
+
+    while pending:
+        future, size = pending.popleft()
+        yield future.result(), size
+
+
+def main(argv=None):
+
+    # Imported lazily by the workers; the field list is only needed here
+    from app.agents.orchestrator import ALL_FIELDS
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.bulk",
+        description="Optimize shipments from a CSV or JSONL file in bulk."
+    )
+    parser.add_argument("input", help="CSV or JSONL file, or - for stdin")
+    parser.add_argument("output", help="JSONL, CSV or Parquet file, or - for stdout (JSONL/CSV)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"))
+    parser.add_argument("--output-format", choices=("jsonl", "csv", "parquet"))
+    parser.add_argument("--fields", help="comma-separated result fields (default: all but ai_reasoning)")
+    parser.add_argument("--with-reasoning", action="store_true", help="call Nova for ai_reasoning on every row")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--progress", type=float, default=10.0, help="seconds between progress lines, 0 for none")
+    args = parser.parse_args(argv)
+
+    input_format = args.input_format or ("jsonl" if args.input == "-" else None)
+    input_format = detect_format(args.input, input_format, ("csv", "jsonl"))
+    output_format = args.output_format or ("jsonl" if args.output == "-" else None)
+    output_format = detect_format(args.output, output_format, ("jsonl", "csv", "parquet"))
+
+    if output_format == "parquet" and args.output == "-":
+        parser.error("Parquet output needs a file path")
+
+    if args.fields:
+        selected = {field.strip() for field in args.fields.split(",") if field.strip()}
+        unknown = selected.difference(ALL_FIELDS)
+        if unknown:
+            parser.error(f"Unknown result fields: {', '.join(sorted(unknown))}")
+        if "ai_reasoning" in selected and not args.with_reasoning:
+            parser.error("ai_reasoning needs --with-reasoning")
+    else:
+        selected = {field for field in ALL_FIELDS if args.with_reasoning or field != "ai_reasoning"}
+
+    fields = tuple(field for field in ALL_FIELDS if field in selected)
+
+    writer = OutputWriter(args.output, output_format, output_columns(fields))
+
+    try:
+        try:
+            run(
+                read_rows(args.input, input_format), writer, fields, output_format,
+                args.workers, args.chunk_size, args.with_reasoning, args.progress
+            )
+        finally:
+            writer.close()
+
+    except BrokenPipeError:
+        # stdout was closed early, e.g. piped into head
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
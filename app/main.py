@@ -1,19 +1,72 @@
-import random
-import time
-from fastapi import FastAPI
-from pydantic import BaseModel
+import json
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from app.agents.models.route_models import BatchRouteResponse, RouteResponse
 from app.agents.orchestrator import LogisticsOrchestrator
 from app.agents.route_agent import optimize_route
-from app.services.executive_ai_service import ExecutiveAIService
+from app.services.executive_ai_service import AdvisoryStreamTruncated, ExecutiveAIService
 from app.services.autonomous_decision_engine import AutonomousDecisionEngine
+from app.services.agent_metrics import agent_metrics
+from app.services.bedrock_gateway import bedrock_gateway
+from app.services.circuit_breaker import bedrock_breaker
+from app.services.json_response import FastJSONResponse
+from app.services.prometheus_metrics import (
+    MetricsMiddleware, metrics, render_agent_metrics, render_circuit_breaker, render_result_cache
+)
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+
+    # Open Bedrock connections in the background when asked to; startup
+    # does not wait
+    if bedrock_gateway.warmup_connections > 0:
+        threading.Thread(target=bedrock_gateway.warm_up, name="bedrock-warm-up", daemon=True).start()
+
+    yield
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(MetricsMiddleware, registry=metrics)
 
 orchestrator = LogisticsOrchestrator()
-executive_ai = ExecutiveAIService()
 decision_engine = AutonomousDecisionEngine()
 
+# Built by the first advisory request rather than at import
+executive_ai = None
+executive_ai_lock = threading.Lock()
+
+
+def get_executive_ai():
+
+    global executive_ai
+
+    if executive_ai is None:
+        with executive_ai_lock:
+            if executive_ai is None:
+                executive_ai = ExecutiveAIService()
+
+    return executive_ai
+
+AGENT_NAMES = [
+    "Route Agent",
+    "Cost Agent",
+    "Carbon Agent",
+    "Risk Agent",
+    "Sustainability Agent",
+    "Explanation Agent",
+    "Comparison Agent",
+    "Simulation Agent",
+    "Uncertainty Simulation",
+    "Performance Agent",
+    "Vehicle Routing Agent",
+    "Nova Reasoning Agent",
+    "Executive AI Agent"
+]
+
 
 class RouteRequest(BaseModel):
     source: str
@@ -21,6 +74,24 @@ class RouteRequest(BaseModel):
     cargo_weight: float
     priority: str
 
+
+class BatchRouteRequest(BaseModel):
+    requests: list[RouteRequest]
+    fields: list[str] | None = None
+
+
+class UncertaintyRequest(RouteRequest):
+    samples: int = Field(10_000, ge=1, le=5_000_000)
+    cost_threshold: float | None = None
+    carbon_threshold: float | None = None
+    seed: int | None = None
+
+
+class ConsolidationRequest(BaseModel):
+    requests: list[RouteRequest]
+    vehicle_capacities: list[float]
+    time_budget_ms: float = 500
+
 @app.get("/")
 def root():
     return {"message": "EcoSmart Agentic Logistics AI Running 🚀"}
@@ -28,67 +99,136 @@ def root():
 @app.get("/agent-status")
 def get_agent_status():
 
-    agents = [
-
-        {
-            "agent": "Input Agent",
-            "status": "Completed",
-            "confidence": random.randint(90, 99),
-            "latency_ms": random.randint(10, 30)
-        },
-
-        {
-            "agent": "Route Optimization Agent",
-            "status": "Completed",
-            "confidence": random.randint(85, 98),
-            "latency_ms": random.randint(40, 80)
-        },
-
-        {
-            "agent": "Sustainability Agent",
-            "status": "Completed",
-            "confidence": random.randint(80, 95),
-            "latency_ms": random.randint(20, 60)
-        },
-
-        {
-            "agent": "Simulation Agent",
-            "status": "Completed",
-            "confidence": random.randint(75, 92),
-            "latency_ms": random.randint(50, 120)
-        },
-
-        {
-            "agent": "Executive AI Agent",
-            "status": "Standby",
-            "confidence": random.randint(70, 90),
-            "latency_ms": random.randint(30, 70)
-        }
-
-    ]
+    snapshot = agent_metrics.snapshot()
+
+    agents = []
+
+    for name in AGENT_NAMES:
+
+        stats = snapshot.get(name) or {"calls": 0, "errors": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        calls = stats["calls"]
+
+        agents.append({
+            "agent": name,
+            "status": "Operational" if calls else "Standby",
+            "success_rate": round(100 * (calls - stats["errors"]) / calls, 1) if calls else 100.0,
+            "latency_ms": stats["p50_ms"],
+            **stats
+        })
 
     return {
         "system_status": "Operational",
         "agents": agents,
-        "total_latency": sum(a["latency_ms"] for a in agents)
+        "total_latency": round(sum(a["latency_ms"] for a in agents), 4)
     }
 
-@app.post("/optimize-route")
-def optimize_route(request: RouteRequest):
-    result = orchestrator.optimize(request)
-    return {"result": result}
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(
+        metrics.render()
+        + render_agent_metrics(agent_metrics.snapshot())
+        + render_result_cache(orchestrator.result_cache.stats())
+        + render_circuit_breaker(bedrock_breaker.stats()),
+        media_type="text/plain; version=0.0.4"
+    )
+
+def parse_fields(fields):
+
+    # Comma-separated result keys; only the agents behind them run
+    if fields is None:
+        return None
+
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+
+    try:
+        return orchestrator.select_fields(selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/optimize-route", response_model=RouteResponse)
+async def optimize_route(request: RouteRequest, defer_reasoning: bool = False, fields: str | None = None):
+
+    fields = parse_fields(fields)
+
+    # Pre-serialized so cached results are not encoded again
+    result = await orchestrator.optimize_json(request, fields, defer_reasoning)
+
+    return Response(content=b'{"result":' + result + b"}", media_type="application/json")
+
+@app.post("/simulate-uncertainty")
+def simulate_uncertainty(request: UncertaintyRequest):
+    return orchestrator.simulate_uncertainty(
+        request,
+        samples=request.samples,
+        cost_threshold=request.cost_threshold,
+        carbon_threshold=request.carbon_threshold,
+        seed=request.seed
+    )
+
+@app.post("/consolidate-routes")
+def consolidate_routes(plan: ConsolidationRequest):
+    return orchestrator.consolidate(
+        plan.requests, plan.vehicle_capacities, plan.time_budget_ms / 1000
+    )
+
+@app.get("/reasoning/{job_id}")
+def reasoning_status(job_id: str):
+
+    status = orchestrator.reasoning_status(job_id)
+
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown reasoning job")
+
+    return status
+
+@app.get("/reasoning/{job_id}/events")
+async def reasoning_events(job_id: str):
+
+    if orchestrator.reasoning_status(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown reasoning job")
+
+    async def events():
+        status = await orchestrator.wait_for_reasoning(job_id)
+        yield f"event: reasoning\ndata: {json.dumps(status)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.post("/optimize-routes", response_model=BatchRouteResponse)
+def optimize_routes(batch: BatchRouteRequest):
+    fields = parse_fields(",".join(batch.fields)) if batch.fields is not None else None
+    results = orchestrator.optimize_batch(batch.requests, fields=fields)
+
+    # Encoded directly; the response model only documents the shape
+    return FastJSONResponse({"results": results})
 
 @app.post("/executive-advisory")
 def executive_advisory(payload: dict):
 
     result_data = payload.get("result", payload)
 
-    advisory = executive_ai.generate_advisory(result_data)
+    advisory = get_executive_ai().generate_advisory(result_data)
 
     return {
         "executive_advisory": advisory
     }
 
+@app.post("/executive-advisory/stream")
+def executive_advisory_stream(payload: dict):
+
+    result_data = payload.get("result", payload)
+
+    def events():
+        try:
+            for text in get_executive_ai().stream_advisory(result_data):
+                yield f"data: {json.dumps({'text': text})}\n\n"
+        except AdvisoryStreamTruncated as e:
+            # Ends with error instead of done so clients know the text is cut off
+            yield f"event: error\ndata: {json.dumps({'error': str(e), 'truncated': True})}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @app.post("/autonomous-decision")
 def autonomous_decision(data: dict):
 
@@ -99,3 +239,24 @@ def autonomous_decision(data: dict):
     return decision
 
 
+
+class DuplexStreamingResponse(StreamingResponse):
+
+    # For responses that are written while the request body is still being
+    # read. StreamingResponse listens for the disconnect on the same receive
+    # channel and would swallow the body; here the body iterator is the only
+    # reader and a disconnect reaches it as ClientDisconnect.
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+@app.post("/autonomous-decisions/stream")
+async def autonomous_decisions_stream(request: Request):
+
+    # NDJSON results in, NDJSON decisions out as each part of the body arrives
+    return DuplexStreamingResponse(
+        decision_engine.stream_decisions(request.stream()),
+        media_type="application/x-ndjson"
+    )
@@ -0,0 +1,89 @@
+import itertools
+import time
+from collections import deque
+
+
+class AgentTimer:
+
+    __slots__ = ("samples", "calls", "errors", "_calls", "_errors")
+
+    def __init__(self, window):
+
+        # deque.append and next(count) are atomic under the GIL, so
+        # recording never takes a lock; readers snapshot the deque.
+        self.samples = deque(maxlen=window)
+        self._calls = itertools.count(1)
+        self._errors = itertools.count(1)
+        self.calls = 0
+        self.errors = 0
+
+    def record(self, elapsed_ns):
+        self.samples.append(elapsed_ns)
+        self.calls = next(self._calls)
+
+    def record_error(self):
+        self.errors = next(self._errors)
+
+    def summary(self):
+
+        samples = sorted(self.samples)
+
+        def percentile(p):
+            if not samples:
+                return 0.0
+            index = min(len(samples) - 1, int(p / 100 * len(samples)))
+            return round(samples[index] / 1e6, 4)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99)
+        }
+
+
+class AgentMetrics:
+
+    def __init__(self, window=2048):
+        self.window = window
+        self.timers = {}
+
+    def timer(self, agent):
+
+        timer = self.timers.get(agent)
+
+        if timer is None:
+            timer = self.timers.setdefault(agent, AgentTimer(self.window))
+
+        return timer
+
+    def record(self, agent, elapsed_ns):
+        self.timer(agent).record(elapsed_ns)
+
+    def record_error(self, agent):
+        self.timer(agent).record_error()
+
+    def call(self, agent, fn, *args):
+
+        start = time.perf_counter_ns()
+
+        try:
+            return fn(*args)
+
+        except Exception:
+            self.record_error(agent)
+            raise
+
+        finally:
+            self.record(agent, time.perf_counter_ns() - start)
+
+    def snapshot(self):
+        return {
+            agent: timer.summary()
+            for agent, timer in list(self.timers.items())
+        }
+
+
+# Shared by the orchestrator, both AI services and /agent-status
+agent_metrics = AgentMetrics()
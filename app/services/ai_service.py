@@ -1,17 +1,34 @@
-import boto3
-import json
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .bedrock_gateway import BedrockGateway, bedrock_gateway
+from .response_cache import ResponseCache
+from .prometheus_metrics import metrics
 
 class NovaAIService:
 
-    def __init__(self):
-        self.client = boto3.client(
-            "bedrock-runtime",
-            region_name="us-east-1"
+    def __init__(self, client=None, max_concurrency=None, timeout=None, cache=None, breaker=None, gateway=None):
+
+        # The shared gateway unless a client or breaker is injected
+        if client is not None or breaker is not None:
+            gateway = BedrockGateway(client=client, breaker=breaker)
+        self.gateway = gateway or bedrock_gateway
+
+        # Bounded pool for model calls so they never occupy the
+        # web server's worker threads.
+        self.max_concurrency = max_concurrency or int(os.getenv("NOVA_MAX_CONCURRENCY", "8"))
+        self.timeout = timeout or float(os.getenv("NOVA_TIMEOUT_SECONDS", "10"))
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="nova-reasoning"
         )
 
-    def generate_reasoning(self, context_data):
+        self.cache = cache or ResponseCache.from_env("nova-reasoning")
+
+    def build_prompt(self, context_data):
 
-        prompt = f"""
+        return f"""
         You are a logistics sustainability AI.
 
         Given the following system decision:
@@ -26,27 +43,57 @@ class NovaAIService:
         including environmental and operational trade-offs.
         """
 
-        body = {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {"text": prompt}
-                    ]
-                }
-            ]
+    def invoke(self, prompt):
+        return self.gateway.invoke(prompt, "nova-reasoning", "Nova Reasoning Agent")
+
+    def cache_fields(self, context_data):
+        return {
+            field: context_data[field]
+            for field in ("route", "cost", "carbon", "risk", "score")
         }
 
+    def generate_reasoning(self, context_data):
+
+        fields = self.cache_fields(context_data)
+
+        cached = self.cache.get(fields)
+        if cached is not None:
+            return cached
+
+        return self.invoke_and_store(self.build_prompt(context_data), fields)
+
+    def invoke_and_store(self, prompt, fields):
+
+        # Runs on the executor for async callers, so the cache write (a
+        # SQLite commit when AI_CACHE_PATH is set) never blocks the loop
+        reasoning = self.invoke(prompt)
+
+        if reasoning:
+            self.cache.set(fields, reasoning)
+
+        return reasoning
+
+    async def generate_reasoning_async(self, context_data):
+
+        fields = self.cache_fields(context_data)
+
+        cached = self.cache.get(fields)
+        if cached is not None:
+            return cached
+
+        prompt = self.build_prompt(context_data)
+        loop = asyncio.get_running_loop()
+
         try:
-            response = self.client.invoke_model(
-                modelId="us.amazon.nova-2-lite-v1:0",
-                body=json.dumps(body),
-                contentType="application/json",
-                accept="application/json"
+            # Cancelling on timeout also drops the call if it is still
+            # queued behind the concurrency limit.
+            reasoning = await asyncio.wait_for(
+                loop.run_in_executor(self.executor, self.invoke_and_store, prompt, fields),
+                timeout=self.timeout
             )
 
-            result = json.loads(response["body"].read())
-            return result["output"]["message"]["content"][0]["text"]
-
-        except Exception:
+        except asyncio.TimeoutError:
+            metrics.inc("ecosmart_bedrock_timeouts_total", service="nova-reasoning")
             return None
+
+        return reasoning
@@ -1,3 +1,26 @@
+import json
+import math
+
+import numpy as np
+
+from .prometheus_metrics import metrics
+
+
+# Lowest score for each decision, highest first; anything below the
+# second goes to executive review
+DECISIONS = (
+    (80, "AUTO_EXECUTE", "AI approved fully autonomous shipment execution."),
+    (60, "SEMI_AUTONOMOUS", "AI recommends execution with optional executive review."),
+    (0, "EXECUTIVE_REVIEW", "Executive intervention recommended.")
+)
+
+RISK_POINTS = {"Low": 100, "Medium": 60}
+OTHER_RISK_POINTS = 40
+
+# Most results scored in one evaluate_batch call while streaming
+STREAM_BATCH_SIZE = 4096
+
+
 class AutonomousDecisionEngine:
 
     def evaluate(self, result):
@@ -11,20 +34,14 @@ class AutonomousDecisionEngine:
             performance * 0.35 +
             sustainability * 0.30 +
             confidence * 0.25 +
-            (100 if risk == "Low" else 60 if risk == "Medium" else 40) * 0.10
+            RISK_POINTS.get(risk, OTHER_RISK_POINTS) * 0.10
         )
 
-        if autonomous_score >= 80:
-            decision = "AUTO_EXECUTE"
-            explanation = "AI approved fully autonomous shipment execution."
-
-        elif autonomous_score >= 60:
-            decision = "SEMI_AUTONOMOUS"
-            explanation = "AI recommends execution with optional executive review."
+        _, decision, explanation = DECISIONS[
+            0 if autonomous_score >= DECISIONS[0][0] else 1 if autonomous_score >= DECISIONS[1][0] else 2
+        ]
 
-        else:
-            decision = "EXECUTIVE_REVIEW"
-            explanation = "Executive intervention recommended."
+        metrics.inc("ecosmart_autonomous_decisions_total", decision=decision)
 
         return {
             "autonomous_score": autonomous_score,
@@ -32,3 +49,126 @@ class AutonomousDecisionEngine:
             "explanation": explanation,
             "execution_probability": min(99, autonomous_score)
         }
+
+    def evaluate_batch(self, results):
+
+        # Same decisions as evaluate for many results in one numpy pass;
+        # the score is summed in the same order so it truncates the same
+        size = len(results)
+
+        if not size:
+            return []
+
+        def column(values):
+            return np.fromiter(values, dtype=np.float64, count=size)
+
+        performance = column(result["overall_performance_index"] for result in results)
+        sustainability = column(result["sustainability_score"] for result in results)
+        confidence = column(result.get("optimization_confidence_score", 50) for result in results)
+        risk = column(RISK_POINTS.get(result["risk_level"], OTHER_RISK_POINTS) for result in results)
+
+        scores = np.trunc(
+            performance * 0.35 +
+            sustainability * 0.30 +
+            confidence * 0.25 +
+            risk * 0.10
+        ).astype(np.int64)
+
+        # Index into DECISIONS: 0 for AUTO_EXECUTE, 1 for SEMI_AUTONOMOUS, 2 otherwise
+        levels = (scores < DECISIONS[0][0]).astype(np.int64) + (scores < DECISIONS[1][0])
+
+        for level, count in enumerate(np.bincount(levels, minlength=len(DECISIONS)).tolist()):
+            if count:
+                metrics.inc("ecosmart_autonomous_decisions_total", amount=count, decision=DECISIONS[level][1])
+
+        return [
+            {
+                "autonomous_score": score,
+                "decision": DECISIONS[level][1],
+                "explanation": DECISIONS[level][2],
+                "execution_probability": min(99, score)
+            }
+            for score, level in zip(scores.tolist(), levels.tolist())
+        ]
+
+    async def stream_decisions(self, chunks):
+
+        # NDJSON in, NDJSON out: each input line is a result (or
+        # {"result": ...}, optionally with an "id" that is echoed back) and
+        # gets one output line, in order. Lines are scored as soon as they
+        # have arrived, so the body is never held in full.
+        pending = b""
+
+        async for chunk in chunks:
+
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+
+            for start in range(0, len(lines), STREAM_BATCH_SIZE):
+                output = self.decide_lines(lines[start:start + STREAM_BATCH_SIZE])
+                if output:
+                    yield output
+
+        if pending.strip():
+            yield self.decide_lines([pending])
+
+    def decide_lines(self, lines):
+
+        entries = []
+
+        for line in lines:
+
+            if not line.strip():
+                continue
+
+            entry_id = None
+
+            try:
+                payload = json.loads(line)
+                if not isinstance(payload, dict):
+                    raise ValueError("expected a JSON object")
+                entry_id = payload.get("id")
+                result = payload.get("result", payload)
+                if not isinstance(result, dict):
+                    raise ValueError("result must be a JSON object")
+                check_result(result)
+                entries.append((entry_id, result, None))
+
+            except ValueError as e:
+                entries.append((entry_id, None, f"invalid result: {e}"))
+
+            except KeyError as e:
+                entries.append((entry_id, None, f"invalid result: missing {e}"))
+
+        decisions = iter(self.evaluate_batch([result for _, result, error in entries if error is None]))
+        output = []
+
+        for entry_id, _, error in entries:
+
+            line = {"error": error} if error is not None else next(decisions)
+
+            if entry_id is not None:
+                line = {"id": entry_id, **line}
+
+            output.append(json.dumps(line))
+
+        return "".join(line + "\n" for line in output).encode("utf-8")
+
+
+def check_result(result):
+
+    # What evaluate_batch needs, so one bad line cannot fail its batch
+    for key in ("overall_performance_index", "sustainability_score", "optimization_confidence_score"):
+        value = result.get(key, 50) if key == "optimization_confidence_score" else result[key]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{key} must be a number")
+        try:
+            # Integers too large for a float overflow here
+            finite = math.isfinite(float(value))
+        except (OverflowError, TypeError):
+            finite = False
+        if not finite:
+            raise ValueError(f"{key} must be a finite number")
+
+    if not isinstance(result["risk_level"], str):
+        raise ValueError("risk_level must be a string")
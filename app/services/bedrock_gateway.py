@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+
+from .agent_metrics import agent_metrics
+from .circuit_breaker import CircuitOpenError, bedrock_breaker
+from .prometheus_metrics import metrics
+
+
+MODEL_ID = "us.amazon.nova-2-lite-v1:0"
+
+
+def create_bedrock_client(pool_size):
+
+    # BEDROCK_FAKE=1 swaps in the local fake so nothing reaches AWS
+    if os.getenv("BEDROCK_FAKE"):
+        from .fake_bedrock import FakeBedrockClient
+        return FakeBedrockClient.from_env()
+
+    # Imported here: boto3 and botocore take a few hundred milliseconds
+    # to load, and deterministic requests never need them
+    import boto3
+    from botocore.config import Config
+
+    # Explicit timeouts and a small retry budget, so an outage or a
+    # throttle fails within seconds instead of botocore's 60 s reads
+    # and repeated retries. The pool is sized for every AI service at
+    # once (botocore keeps 10) and TCP keep-alive holds idle
+    # connections open between bursts.
+    config = Config(
+        connect_timeout=float(os.getenv("BEDROCK_CONNECT_TIMEOUT_SECONDS", "2")),
+        read_timeout=float(os.getenv("BEDROCK_READ_TIMEOUT_SECONDS", "10")),
+        retries={"max_attempts": int(os.getenv("BEDROCK_MAX_ATTEMPTS", "2")), "mode": "standard"},
+        max_pool_connections=pool_size,
+        tcp_keepalive=True
+    )
+
+    return boto3.client("bedrock-runtime", region_name="us-east-1", config=config)
+
+
+def build_body(prompt, max_tokens=None):
+
+    body = {
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"text": prompt}
+                ]
+            }
+        ]
+    }
+
+    if max_tokens is not None:
+        body["inferenceConfig"] = {"maxTokens": max_tokens}
+
+    return json.dumps(body)
+
+
+class BedrockGateway:
+
+    def __init__(self, client=None, breaker=None, pool_size=None):
+
+        # One client, so one connection pool, for every AI service. It is
+        # created on first use, so a worker starts without touching boto3.
+        self.pool_size = pool_size or int(os.getenv("BEDROCK_POOL_SIZE", "32"))
+        self._client = client
+        self.breaker = breaker or bedrock_breaker
+        self.lock = threading.Lock()
+
+        # Connections to open at startup. Off by default: warm-up imports
+        # boto3 and makes billed calls before any AI request has arrived.
+        self.warmup_connections = int(os.getenv("BEDROCK_WARMUP_CONNECTIONS", "0"))
+
+    @property
+    def client(self):
+
+        if self._client is None:
+            with self.lock:
+                if self._client is None:
+                    self._client = create_bedrock_client(self.pool_size)
+
+        return self._client
+
+    def invoke(self, prompt, service, agent):
+
+        # Model text, or None when the call failed or the breaker is
+        # open. Timings and errors are recorded under service and agent.
+        if not self.breaker.allow():
+            metrics.inc("ecosmart_bedrock_short_circuits_total", service=service)
+            return None
+
+        start = time.perf_counter_ns()
+
+        try:
+            response = self.client.invoke_model(
+                modelId=MODEL_ID,
+                body=build_body(prompt),
+                contentType="application/json",
+                accept="application/json"
+            )
+
+            result = json.loads(response["body"].read())
+            text = result["output"]["message"]["content"][0]["text"]
+
+            self.breaker.record_success()
+            return text
+
+        except Exception as e:
+            self.breaker.record_failure()
+            self.record_error(e, service, agent)
+            return None
+
+        finally:
+            self.record_call(time.perf_counter_ns() - start, service, agent)
+
+    def stream(self, prompt, service, agent):
+
+        # Yields text deltas; raises when the call fails or is skipped
+        if not self.breaker.allow():
+            metrics.inc("ecosmart_bedrock_short_circuits_total", service=service)
+            raise CircuitOpenError("Bedrock circuit is open")
+
+        start = time.perf_counter_ns()
+
+        try:
+            response = self.client.invoke_model_with_response_stream(
+                modelId=MODEL_ID,
+                body=build_body(prompt),
+                contentType="application/json",
+                accept="application/json"
+            )
+
+            for event in response["body"]:
+
+                chunk = event.get("chunk")
+                if not chunk:
+                    continue
+
+                delta = json.loads(chunk["bytes"]).get("contentBlockDelta", {}).get("delta", {})
+
+                if delta.get("text"):
+                    yield delta["text"]
+
+            self.breaker.record_success()
+
+        except Exception as e:
+            self.breaker.record_failure()
+            self.record_error(e, service, agent)
+            raise
+
+        finally:
+            self.record_call(time.perf_counter_ns() - start, service, agent)
+
+    def warm_up(self, connections=None):
+
+        # Opens connections ahead of the first request with concurrent
+        # one-token calls, so TLS handshakes are not paid by real traffic.
+        # Failures are ignored and do not count against the breaker.
+        connections = self.warmup_connections if connections is None else connections
+        connections = min(connections, self.pool_size)
+
+        def call():
+            try:
+                self.client.invoke_model(
+                    modelId=MODEL_ID,
+                    body=build_body("ping", max_tokens=1),
+                    contentType="application/json",
+                    accept="application/json"
+                )["body"].read()
+            except Exception as e:
+                print("Bedrock warm-up failed:", e)
+
+        threads = [threading.Thread(target=call, daemon=True) for _ in range(connections)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def record_call(self, elapsed_ns, service, agent):
+        agent_metrics.record(agent, elapsed_ns)
+        metrics.observe("ecosmart_bedrock_call_duration_seconds", elapsed_ns / 1e9, service=service)
+
+    def record_error(self, error, service, agent):
+
+        agent_metrics.record_error(agent)
+        metrics.inc("ecosmart_bedrock_errors_total", service=service)
+
+        if "Timeout" in type(error).__name__:
+            metrics.inc("ecosmart_bedrock_timeouts_total", service=service)
+
+
+# Shared by every AI service
+bedrock_gateway = BedrockGateway()
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0, clock=time.monotonic):
+
+        # closed: calls go through and consecutive failures are counted.
+        # open: calls are refused until reset_seconds have passed.
+        # half_open: a single probe decides whether to close or reopen.
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = None
+        self.opens = 0
+
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            failure_threshold=int(os.getenv("BEDROCK_BREAKER_FAILURES", "5")),
+            reset_seconds=float(os.getenv("BEDROCK_BREAKER_RESET_SECONDS", "30"))
+        )
+
+    def allow(self):
+
+        with self.lock:
+
+            if self.state == "closed":
+                return True
+
+            now = self.clock()
+
+            if self.state == "open":
+                if now - self.opened_at < self.reset_seconds:
+                    return False
+                self.state = "half_open"
+                self.probe_started = None
+
+            # A probe that never reported back (cancelled, say) must not
+            # keep the circuit half-open forever
+            if self.probe_started is not None and now - self.probe_started < self.reset_seconds:
+                return False
+
+            self.probe_started = now
+            return True
+
+    def record_success(self):
+
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+            self.probe_started = None
+
+    def record_failure(self):
+
+        with self.lock:
+
+            self.failures += 1
+
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opens += 1
+                self.state = "open"
+                self.opened_at = self.clock()
+                self.probe_started = None
+
+    def stats(self):
+
+        with self.lock:
+            state = self.state
+            # An expired open circuit will let the next call probe
+            if state == "open" and self.clock() - self.opened_at >= self.reset_seconds:
+                state = "half_open"
+            return {"state": state, "failures": self.failures, "opens": self.opens}
+
+
+# One Bedrock endpoint, so both AI services trip and recover together
+bedrock_breaker = CircuitBreaker.from_env()
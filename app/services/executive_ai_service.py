@@ -1,51 +1,125 @@
-import boto3
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .bedrock_gateway import BedrockGateway, bedrock_gateway
+from .micro_batcher import MicroBatcher
+from .response_cache import ResponseCache
+from .prometheus_metrics import metrics
+
+
+class AdvisoryStreamTruncated(Exception):
+
+    # Nova failed after part of the advisory was streamed
+    pass
 
 
 class ExecutiveAIService:
 
-    def __init__(self):
+    def __init__(self, client=None, cache=None, breaker=None, gateway=None, batcher=None):
 
-        # Bedrock client
-        self.client = boto3.client(
-            "bedrock-runtime",
-            region_name="us-east-1"
-        )
+        # Bedrock access goes through the shared gateway unless a client
+        # or breaker is injected
+        if client is not None or breaker is not None:
+            gateway = BedrockGateway(client=client, breaker=breaker)
+        self.gateway = gateway or bedrock_gateway
+
+        self.cache = cache or ResponseCache.from_env("executive-advisory")
+
+        # Optional micro-batching: advisories requested within the window
+        # share one structured Nova call, saving requests against the
+        # Bedrock quota. Off unless EXECUTIVE_BATCH_WINDOW_MS is set.
+        self.batcher = batcher
+
+        window_ms = float(os.getenv("EXECUTIVE_BATCH_WINDOW_MS", "0"))
+
+        if self.batcher is None and window_ms > 0:
+            self.batcher = MicroBatcher(
+                self.generate_nova_batch,
+                window_seconds=window_ms / 1000,
+                max_items=int(os.getenv("EXECUTIVE_BATCH_SIZE", "8")),
+                max_concurrency=int(os.getenv("EXECUTIVE_BATCH_CONCURRENCY", "4")),
+                name="executive-batch"
+            )
 
 
     # -----------------------------
     # Nova Bedrock Call Function
     # -----------------------------
     def generate_nova_response(self, prompt):
+        return self.gateway.invoke(prompt, "executive-advisory", "Executive AI Agent")
 
-        body = {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {"text": prompt}
-                    ]
-                }
-            ]
-        }
+
+    # -----------------------------
+    # Nova Bedrock Streaming Call
+    # -----------------------------
+    def stream_nova_response(self, prompt):
+        return self.gateway.stream(prompt, "executive-advisory", "Executive AI Agent")
+
+
+    # -----------------------------
+    # Nova Batched Call
+    # -----------------------------
+    def generate_nova_batch(self, items):
+
+        # One advisory (or None) per result, from a single combined call
+        # when there are several
+        if len(items) == 1:
+            return [self.generate_nova_response(self.build_prompt(items[0]))]
+
+        metrics.observe("ecosmart_executive_batch_items", len(items))
+
+        response = self.generate_nova_response(self.build_batch_prompt(items))
+
+        # Results the combined call failed or the model skipped are asked
+        # for one at a time; an open circuit turns those away cheaply
+        if response is None:
+            advisories = [None] * len(items)
+        else:
+            advisories = self.parse_batch_response(response, len(items))
+
+        missing = [i for i, advisory in enumerate(advisories) if advisory is None]
+
+        if missing:
+            metrics.inc("ecosmart_executive_batch_fallback_total", amount=len(missing))
+
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                retried = pool.map(lambda i: self.generate_nova_response(self.build_prompt(items[i])), missing)
+                for i, advisory in zip(missing, retried):
+                    advisories[i] = advisory
+
+        return advisories
+
+
+    def parse_batch_response(self, response, count):
+
+        # Advisory text by position; None where the model's JSON was
+        # missing, malformed or skipped that result
+        advisories = [None] * count
+
+        start, end = response.find("["), response.rfind("]")
+        if start < 0 or end < start:
+            return advisories
 
         try:
+            entries = json.loads(response[start:end + 1])
+        except ValueError:
+            return advisories
 
-            response = self.client.invoke_model(
-                modelId="us.amazon.nova-2-lite-v1:0",
-                body=json.dumps(body),
-                contentType="application/json",
-                accept="application/json"
-            )
+        if not isinstance(entries, list):
+            return advisories
 
-            result = json.loads(response["body"].read())
+        for entry in entries:
 
-            return result["output"]["message"]["content"][0]["text"]
+            if not isinstance(entry, dict):
+                continue
 
-        except Exception as e:
+            index, advisory = entry.get("id"), entry.get("advisory")
+
+            if isinstance(index, int) and 0 <= index < count and isinstance(advisory, str) and advisory.strip():
+                advisories[index] = advisory.strip()
 
-            print("Nova error:", e)
-            return None
+        return advisories
 
 
     # -----------------------------
@@ -53,9 +127,95 @@ class ExecutiveAIService:
     # -----------------------------
     def generate_advisory(self, result_data):
 
+        cache_fields = self.cache_fields(result_data)
+
+        cached = self.cache.get(cache_fields)
+        if cached is not None:
+            return cached
+
+        try:
+
+            # Rendering the prompt first checks the result has every field
+            # Nova needs, so a bad one never joins a batch
+            prompt = self.build_prompt(result_data)
+
+            # Call Nova
+            if self.batcher is not None:
+                response = self.batcher.submit(result_data)
+            else:
+                response = self.generate_nova_response(prompt)
+
+            if response:
+                self.cache.set(cache_fields, response)
+                return response
+
+        except Exception as e:
+
+            metrics.inc("ecosmart_executive_errors_total", mode="advisory", error=type(e).__name__)
+
+        metrics.inc("ecosmart_executive_fallback_total", mode="advisory")
+
+        return self.build_fallback_advisory(result_data)
+
+
+    # -----------------------------
+    # Streaming Advisory Generator
+    # -----------------------------
+    def stream_advisory(self, result_data):
+
+        cache_fields = self.cache_fields(result_data)
+
+        cached = self.cache.get(cache_fields)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+
         try:
 
-            prompt = f"""
+            for text in self.stream_nova_response(self.build_prompt(result_data)):
+                chunks.append(text)
+                yield text
+
+            if chunks:
+                self.cache.set(cache_fields, "".join(chunks))
+                return
+
+        except Exception as e:
+
+            metrics.inc("ecosmart_executive_errors_total", mode="stream", error=type(e).__name__)
+
+            # Text already sent cannot be replaced by the fallback, so the
+            # caller is told the advisory is incomplete
+            if chunks:
+                metrics.inc("ecosmart_executive_stream_truncated_total")
+                raise AdvisoryStreamTruncated("Nova stopped mid-advisory") from e
+
+        metrics.inc("ecosmart_executive_fallback_total", mode="stream")
+
+        for line in self.build_fallback_advisory(result_data).splitlines(keepends=True):
+            yield line
+
+
+    def cache_fields(self, result_data):
+
+        # Advisories depend only on these result fields
+        return {
+            field: result_data.get(field)
+            for field in (
+                "optimized_route",
+                "estimated_cost",
+                "carbon_impact",
+                "sustainability_score",
+                "overall_performance_index"
+            )
+        }
+
+
+    def build_prompt(self, result_data):
+
+        return f"""
                 You are an Executive Logistics AI Advisor.
 
                 Analyze this logistics optimization result and provide executive-level strategic recommendations.
@@ -73,20 +233,41 @@ class ExecutiveAIService:
                 • Executive decision guidance
                 """
 
-            # Call Nova
-            response = self.generate_nova_response(prompt)
 
-            if response:
-                return response
+    def build_batch_prompt(self, items):
 
-        except Exception as e:
+        results = "\n".join(
+            f"""
+                Result {i}:
+                Route: {result_data['optimized_route']}
+                Cost: {result_data['estimated_cost']}
+                Carbon Impact: {result_data['carbon_impact']}
+                Sustainability Score: {result_data['sustainability_score']}
+                Performance Index: {result_data['overall_performance_index']}
+                """
+            for i, result_data in enumerate(items)
+        )
 
-            print("Nova unavailable:", e)
+        return f"""
+                You are an Executive Logistics AI Advisor.
 
+                Analyze each of these {len(items)} logistics optimization results and provide executive-level strategic recommendations for each one.
+                {results}
+                For every result provide:
+                • Strategic recommendation
+                • Risk assessment
+                • Sustainability improvement suggestion
+                • Executive decision guidance
 
-        # -----------------------------
-        # FALLBACK LOGIC
-        # -----------------------------
+                Respond with only a JSON array containing one object per result, in order:
+                [{{"id": 0, "advisory": "..."}}, {{"id": 1, "advisory": "..."}}]
+                """
+
+
+    # -----------------------------
+    # FALLBACK LOGIC
+    # -----------------------------
+    def build_fallback_advisory(self, result_data):
 
         sustainability = result_data["sustainability_score"]
         performance = result_data["overall_performance_index"]
@@ -0,0 +1,181 @@
+import io
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+
+
+class FakeBedrockError(Exception):
+    pass
+
+
+class FakeReadTimeoutError(FakeBedrockError):
+    pass
+
+
+class FakeThrottlingError(FakeBedrockError):
+    pass
+
+
+class FakeBedrockClient:
+
+    def __init__(
+        self,
+        latency=0.0,
+        mode="ok",
+        text="Stubbed Nova response for local testing.",
+        distribution="fixed",
+        spread=0.5,
+        error_rate=0.0,
+        timeout_rate=0.0,
+        rate_per_second=0.0,
+        burst=None,
+        seed=None
+    ):
+
+        # Stand-in for the bedrock-runtime client. Every call sleeps for a
+        # latency drawn from distribution ("fixed", "uniform": latency
+        # +/- spread * latency, "lognormal": median latency, sigma spread).
+        # mode "fail" or "timeout" makes every call raise; error_rate and
+        # timeout_rate make a random share of them raise. rate_per_second
+        # throttles like the Bedrock quota: a token bucket of burst calls
+        # refilled at that rate, 0 for no limit. All can change at runtime.
+        self.latency = latency
+        self.mode = mode
+        self.text = text
+        self.distribution = distribution
+        self.spread = spread
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+
+        self.rng = random.Random(seed)
+        self.tokens = None
+        self.refilled_at = time.monotonic()
+        self.lock = threading.Lock()
+
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+
+    @classmethod
+    def from_env(cls):
+
+        seed = os.getenv("BEDROCK_FAKE_SEED")
+        burst = os.getenv("BEDROCK_FAKE_BURST")
+
+        return cls(
+            latency=float(os.getenv("BEDROCK_FAKE_LATENCY_SECONDS", "0")),
+            mode=os.getenv("BEDROCK_FAKE_MODE", "ok"),
+            distribution=os.getenv("BEDROCK_FAKE_LATENCY_DISTRIBUTION", "fixed"),
+            spread=float(os.getenv("BEDROCK_FAKE_LATENCY_SPREAD", "0.5")),
+            error_rate=float(os.getenv("BEDROCK_FAKE_ERROR_RATE", "0")),
+            timeout_rate=float(os.getenv("BEDROCK_FAKE_TIMEOUT_RATE", "0")),
+            rate_per_second=float(os.getenv("BEDROCK_FAKE_RATE_PER_SECOND", "0")),
+            burst=float(burst) if burst else None,
+            seed=int(seed) if seed else None
+        )
+
+    def invoke_model(self, modelId, body, contentType=None, accept=None):
+
+        text = self._respond(body)
+
+        payload = {"output": {"message": {"content": [{"text": text}]}}}
+
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+    def invoke_model_with_response_stream(self, modelId, body, contentType=None, accept=None):
+
+        words = self._respond(body).split(" ")
+
+        return {
+            "body": (
+                {"chunk": {"bytes": json.dumps(
+                    {"contentBlockDelta": {"delta": {"text": word if i == 0 else " " + word}}}
+                ).encode("utf-8")}}
+                for i, word in enumerate(words)
+            )
+        }
+
+    def _respond(self, body):
+
+        with self.lock:
+            self.calls += 1
+            throttled = not self._take_token()
+            delay = self._draw_latency()
+            roll = self.rng.random()
+
+        # Throttled calls are refused straight away, like a 429
+        if throttled:
+            with self.lock:
+                self.throttled += 1
+            raise FakeThrottlingError("fake Bedrock throttling: rate exceeded")
+
+        if delay:
+            time.sleep(delay)
+
+        if self.mode == "fail" or roll < self.error_rate:
+            with self.lock:
+                self.errors += 1
+            raise FakeBedrockError("fake Bedrock failure")
+
+        if self.mode == "timeout" or roll < self.error_rate + self.timeout_rate:
+            with self.lock:
+                self.errors += 1
+            raise FakeReadTimeoutError("fake Bedrock read timeout")
+
+        return self._answer(body)
+
+    def _answer(self, body):
+
+        # Batched advisory prompts ask for a JSON array with one object
+        # per "Result i:" block; answer in that shape
+        prompt = json.loads(body)["messages"][0]["content"][0]["text"]
+
+        if "JSON array" not in prompt:
+            return self.text
+
+        count = len(re.findall(r"^\s*Result \d+:", prompt, flags=re.MULTILINE))
+
+        return json.dumps([{"id": i, "advisory": self.text} for i in range(count)])
+
+    def _take_token(self):
+
+        if not self.rate_per_second:
+            return True
+
+        burst = self.burst or self.rate_per_second
+        now = time.monotonic()
+
+        if self.tokens is None:
+            self.tokens = burst
+
+        self.tokens = min(burst, self.tokens + (now - self.refilled_at) * self.rate_per_second)
+        self.refilled_at = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+    def _draw_latency(self):
+
+        if self.latency <= 0:
+            return 0.0
+
+        if self.distribution == "uniform":
+            return max(0.0, self.rng.uniform(self.latency * (1 - self.spread), self.latency * (1 + self.spread)))
+
+        if self.distribution == "lognormal":
+            return self.rng.lognormvariate(math.log(self.latency), self.spread)
+
+        return self.latency
+
+    def stats(self):
+        with self.lock:
+            return {"calls": self.calls, "errors": self.errors, "throttled": self.throttled}
@@ -0,0 +1,37 @@
+import dataclasses
+import json
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_default(value):
+
+    # Slotted result objects (AlternativeRoute, SimulationScenario) for the
+    # stdlib encoder; orjson serializes dataclasses itself
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+
+    # Compact UTF-8 JSON bytes. orjson when it is installed, otherwise the
+    # stdlib with the same settings as Starlette's JSONResponse.
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+    return json.dumps(
+        value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"), default=encode_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+
+    def render(self, content):
+        return dumps(content)
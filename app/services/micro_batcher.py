@@ -0,0 +1,80 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class MicroBatcher:
+
+    def __init__(self, run_batch, window_seconds=0.02, max_items=8, max_concurrency=4, name="micro-batcher"):
+
+        # run_batch takes a list of items and returns one result per item,
+        # in order. Items that arrive within window_seconds of the first
+        # one (up to max_items) share a call; batches run concurrently on
+        # up to max_concurrency threads while the next one is collected.
+        self.run_batch = run_batch
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+        self.name = name
+
+        self.queue = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=name)
+
+        self.collector = None
+        self.lock = threading.Lock()
+
+    def submit(self, item):
+
+        # Blocks the caller until its batch has run
+        return self.submit_future(item).result()
+
+    def submit_future(self, item):
+
+        future = Future()
+        self.ensure_collector()
+        self.queue.put((item, future))
+
+        return future
+
+    def ensure_collector(self):
+
+        if self.collector is None:
+            with self.lock:
+                if self.collector is None:
+                    self.collector = threading.Thread(target=self.collect, name=f"{self.name}-collector", daemon=True)
+                    self.collector.start()
+
+    def collect(self):
+
+        while True:
+
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.window_seconds
+
+            while len(batch) < self.max_items:
+                try:
+                    batch.append(self.queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            self.executor.submit(self.dispatch, batch)
+
+    def dispatch(self, batch):
+
+        try:
+            results = self.run_batch([item for item, _ in batch])
+
+        except Exception as e:
+
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+
+            # Run the items one at a time so a single bad item only fails
+            # its own caller
+            for item, future in batch:
+                self.dispatch([(item, future)])
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -1,51 +1,19 @@
-import boto3
-import json
+from .bedrock_gateway import bedrock_gateway
 
 
 class ExecutiveAIService:
 
-    def __init__(self):
+    def __init__(self, gateway=None):
 
-        # Bedrock client
-        self.client = boto3.client(
-            "bedrock-runtime",
-            region_name="us-east-1"
-        )
+        # Bedrock access goes through the shared gateway
+        self.gateway = gateway or bedrock_gateway
 
 
     # -----------------------------
     # Nova Bedrock Call Function
     # -----------------------------
     def generate_nova_response(self, prompt):
-
-        body = {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {"text": prompt}
-                    ]
-                }
-            ]
-        }
-
-        try:
-
-            response = self.client.invoke_model(
-                modelId="us.amazon.nova-2-lite-v1:0",
-                body=json.dumps(body),
-                contentType="application/json",
-                accept="application/json"
-            )
-
-            result = json.loads(response["body"].read())
-
-            return result["output"]["message"]["content"][0]["text"]
-
-        except Exception as e:
-
-            print("Nova error:", e)
-            return None
+        return self.gateway.invoke(prompt, "executive-advisory", "Executive AI Agent")
 
 
     # -----------------------------
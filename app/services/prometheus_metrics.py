@@ -0,0 +1,239 @@
+import bisect
+import threading
+import time
+
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+
+        self.definitions = {}
+
+        # Each thread writes only to its own shard, so recording is
+        # lock-free; the lock is taken once per thread to register it.
+        self.local = threading.local()
+        self.shards = []
+        self.shards_lock = threading.Lock()
+
+    def counter(self, name, help_text):
+        self.definitions[name] = ("counter", help_text, None)
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.definitions[name] = ("histogram", help_text, tuple(buckets))
+
+    def inc(self, name, amount=1, **labels):
+
+        shard = self._shard()
+        key = (name, tuple(sorted(labels.items())))
+
+        shard[key] = shard.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+
+        shard = self._shard()
+        key = (name, tuple(sorted(labels.items())))
+        buckets = self.definitions[name][2]
+
+        entry = shard.get(key)
+        if entry is None:
+            entry = shard[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+
+        entry[0][bisect.bisect_left(buckets, seconds)] += 1
+        entry[1] += seconds
+        entry[2] += 1
+
+    def render(self):
+
+        counters = {}
+        histograms = {}
+
+        for shard in list(self.shards):
+
+            for (name, labels), value in list(shard.items()):
+
+                if self.definitions[name][0] == "counter":
+                    counters[(name, labels)] = counters.get((name, labels), 0) + value
+                    continue
+
+                merged = histograms.get((name, labels))
+                if merged is None:
+                    merged = histograms[(name, labels)] = [[0] * len(value[0]), 0.0, 0]
+
+                for i, count in enumerate(value[0]):
+                    merged[0][i] += count
+                merged[1] += value[1]
+                merged[2] += value[2]
+
+        lines = []
+
+        for name, (kind, help_text, buckets) in self.definitions.items():
+
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            if kind == "counter":
+                for (series, labels), value in counters.items():
+                    if series == name:
+                        lines.append(f"{name}{format_labels(labels)} {value}")
+                continue
+
+            for (series, labels), (bucket_counts, total, count) in histograms.items():
+
+                if series != name:
+                    continue
+
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ("+Inf",), bucket_counts):
+                    cumulative += bucket_count
+                    le = bound if bound == "+Inf" else repr(float(bound))
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', le),))} {cumulative}")
+
+                lines.append(f"{name}_sum{format_labels(labels)} {total}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+    def _shard(self):
+
+        shard = getattr(self.local, "shard", None)
+
+        if shard is None:
+            shard = self.local.shard = {}
+            with self.shards_lock:
+                self.shards.append(shard)
+
+        return shard
+
+
+def format_labels(labels):
+
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels) + "}"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_agent_metrics(snapshot):
+
+    # Agent timings live in AgentMetrics; expose them as a summary
+    lines = [
+        "# HELP ecosmart_agent_calls_total Agent calls by agent.",
+        "# TYPE ecosmart_agent_calls_total counter"
+    ]
+    lines += [f'ecosmart_agent_calls_total{format_labels((("agent", agent),))} {stats["calls"]}' for agent, stats in snapshot.items()]
+
+    lines += [
+        "# HELP ecosmart_agent_errors_total Agent calls that failed, by agent.",
+        "# TYPE ecosmart_agent_errors_total counter"
+    ]
+    lines += [f'ecosmart_agent_errors_total{format_labels((("agent", agent),))} {stats["errors"]}' for agent, stats in snapshot.items()]
+
+    lines += [
+        "# HELP ecosmart_agent_latency_seconds Rolling agent latency quantiles.",
+        "# TYPE ecosmart_agent_latency_seconds summary"
+    ]
+    for agent, stats in snapshot.items():
+        for quantile, field in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+            labels = format_labels((("agent", agent), ("quantile", quantile)))
+            lines.append(f"ecosmart_agent_latency_seconds{labels} {stats[field] / 1000}")
+
+    return "\n".join(lines) + "\n"
+
+
+def render_result_cache(stats):
+
+    lines = []
+
+    for name, kind, help_text, field in (
+        ("ecosmart_result_cache_hits_total", "counter", "Optimize results served from the result cache.", "hits"),
+        ("ecosmart_result_cache_misses_total", "counter", "Optimize results computed on a cache miss.", "misses"),
+        ("ecosmart_result_cache_invalidations_total", "counter", "Result cache flushes after agent parameters changed.", "invalidations"),
+        ("ecosmart_result_cache_hit_ratio", "gauge", "Share of result cache lookups that hit.", "hit_ratio"),
+        ("ecosmart_result_cache_entries", "gauge", "Results currently cached.", "entries"),
+        ("ecosmart_result_cache_memory_bytes", "gauge", "Approximate memory held by cached results.", "memory_bytes")
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {stats[field]}"]
+
+    return "\n".join(lines) + "\n"
+
+
+def render_circuit_breaker(stats):
+
+    states = ("closed", "half_open", "open")
+
+    lines = [
+        "# HELP ecosmart_bedrock_circuit_state Bedrock circuit breaker state (1 for the current one).",
+        "# TYPE ecosmart_bedrock_circuit_state gauge"
+    ]
+    lines += [
+        f'ecosmart_bedrock_circuit_state{format_labels((("state", state),))} {int(stats["state"] == state)}'
+        for state in states
+    ]
+    lines += [
+        "# HELP ecosmart_bedrock_circuit_opens_total Times the Bedrock circuit breaker opened.",
+        "# TYPE ecosmart_bedrock_circuit_opens_total counter",
+        f"ecosmart_bedrock_circuit_opens_total {stats['opens']}"
+    ]
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+
+    def __init__(self, app, registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+
+        finally:
+            # Label by route template so job ids do not explode cardinality
+            route = getattr(scope.get("route"), "path", "unmatched")
+
+            self.registry.inc(
+                "ecosmart_http_requests_total",
+                route=route, method=scope["method"], status=status[0]
+            )
+            self.registry.observe(
+                "ecosmart_http_request_duration_seconds",
+                time.perf_counter() - start,
+                route=route, method=scope["method"]
+            )
+
+
+metrics = MetricsRegistry()
+
+metrics.counter("ecosmart_http_requests_total", "HTTP requests by route, method and status.")
+metrics.histogram("ecosmart_http_request_duration_seconds", "HTTP request latency by route.")
+metrics.histogram("ecosmart_bedrock_call_duration_seconds", "Bedrock invoke latency by service.")
+metrics.counter("ecosmart_bedrock_errors_total", "Bedrock calls that raised, by service.")
+metrics.counter("ecosmart_bedrock_timeouts_total", "Bedrock calls that hit a timeout, by service.")
+metrics.counter("ecosmart_bedrock_short_circuits_total", "Bedrock calls skipped because the circuit was open, by service.")
+metrics.counter("ecosmart_optimize_degraded_total", "Optimize responses returned with fields missing, by field.")
+metrics.counter("ecosmart_executive_fallback_total", "Fallback advisories served instead of Nova output.")
+metrics.counter("ecosmart_executive_errors_total", "Advisory requests that raised before Nova answered, by mode and error.")
+metrics.counter("ecosmart_executive_stream_truncated_total", "Streamed advisories cut off after Nova text was sent.")
+metrics.histogram("ecosmart_executive_batch_items", "Advisories combined into one Nova call.", buckets=(2, 4, 8, 16, 32, 64))
+metrics.counter("ecosmart_executive_batch_fallback_total", "Batched advisories retried as single calls after the combined call failed or its reply could not be parsed.")
+metrics.counter("ecosmart_autonomous_decisions_total", "AutonomousDecisionEngine outcomes by decision.")
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+
+
+class ReasoningJobs:
+
+    def __init__(self, max_jobs=None):
+
+        # Oldest jobs are dropped first once the limit is reached, so
+        # clients are expected to collect results shortly after submitting.
+        self.max_jobs = max_jobs or int(os.getenv("REASONING_JOB_LIMIT", "10000"))
+        self.jobs = OrderedDict()
+
+    def submit(self, coroutine):
+
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = asyncio.get_running_loop().create_task(coroutine)
+
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+
+        return job_id
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def result(self, job_id):
+
+        task = self.jobs.get(job_id)
+
+        if task is None or not task.done():
+            return None
+
+        if task.cancelled() or task.exception() is not None:
+            return None
+
+        return task.result()
+
+    async def wait(self, job_id):
+
+        task = self.jobs.get(job_id)
+
+        if task is None:
+            return None
+
+        # Shield so a disconnecting client does not cancel the shared job
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            pass
+
+        return self.result(job_id)
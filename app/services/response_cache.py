@@ -0,0 +1,153 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+
+    def __init__(self, namespace, max_entries=1024, ttl_seconds=3600, path=None, quantize=None):
+
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # Optional {field: step}; numeric fields are snapped to the nearest
+        # multiple of step so near-identical results share one entry.
+        self.quantize = quantize or {}
+
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.db = None
+
+        if path:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self.db.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),))
+            self.db.commit()
+
+    @classmethod
+    def from_env(cls, namespace):
+
+        quantize = {}
+
+        for item in os.getenv("AI_CACHE_QUANTIZE", "").split(","):
+            if "=" in item:
+                field, step = item.split("=", 1)
+                quantize[field.strip()] = float(step)
+
+        return cls(
+            namespace,
+            max_entries=int(os.getenv("AI_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("AI_CACHE_TTL_SECONDS", "3600")),
+            path=os.getenv("AI_CACHE_PATH") or None,
+            quantize=quantize
+        )
+
+    def make_key(self, fields):
+
+        normalized = {}
+
+        for name, value in fields.items():
+            step = self.quantize.get(name)
+            if step and isinstance(value, (int, float)):
+                value = round(round(value / step) * step, 6)
+            normalized[name] = value
+
+        return self.namespace + ":" + json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+    def get(self, fields):
+
+        key = self.make_key(fields)
+        now = time.time()
+
+        with self.lock:
+
+            entry = self.entries.get(key)
+
+            if entry is None and self.db is not None:
+                row = self.db.execute(
+                    "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = row
+                    self._remember(key, entry)
+
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    self._forget(key)
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, fields, value):
+
+        key = self.make_key(fields)
+        now = time.time()
+        entry = (value, now + self.ttl_seconds)
+
+        with self.lock:
+
+            self._remember(key, entry)
+
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, entry[0], entry[1])
+                )
+                self._trim_db(now)
+                self.db.commit()
+
+    def stats(self):
+
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remember(self, key, entry):
+
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _trim_db(self, now):
+
+        # The table gets the same bounds as memory: expired rows go, and
+        # past max_entries the rows written longest ago. Only this
+        # namespace's keys, which sort between "namespace:" and "namespace;".
+        low, high = self.namespace + ":", self.namespace + ";"
+
+        self.db.execute(
+            "DELETE FROM response_cache WHERE key >= ? AND key < ? AND ("
+            "expires_at <= ? OR key NOT IN ("
+            "SELECT key FROM response_cache WHERE key >= ? AND key < ? "
+            "ORDER BY expires_at DESC LIMIT ?))",
+            (low, high, now, low, high, self.max_entries)
+        )
+
+    def _forget(self, key):
+
+        self.entries.pop(key, None)
+
+        if self.db is not None:
+            self.db.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self.db.commit()
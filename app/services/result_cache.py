@@ -0,0 +1,205 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from app.agents.models.route_models import RouteRequest
+from app.services.json_response import dumps
+
+
+def approximate_size(value):
+
+    # Deep sys.getsizeof over JSON-like data and slotted result objects;
+    # shared objects count twice
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + approximate_size(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += approximate_size(item)
+    elif hasattr(type(value), "__slots__"):
+        for name in type(value).__slots__:
+            size += approximate_size(getattr(value, name))
+
+    return size
+
+
+class CachedResult:
+
+    __slots__ = ("result", "reasoning_context", "fragments", "size")
+
+    def __init__(self, result, reasoning_context):
+
+        self.result = result
+        self.reasoning_context = reasoning_context
+
+        # Serialized b'"field":value' pieces, so a hit never re-encodes
+        self.fragments = {
+            field: dumps(field) + b":" + dumps(value)
+            for field, value in result.items()
+        }
+
+        self.size = approximate_size(result) + sum(
+            sys.getsizeof(fragment) for fragment in self.fragments.values()
+        )
+
+    def render(self, overrides=None, extra=None):
+
+        # JSON object (UTF-8 bytes) for the result with some fields
+        # replaced and extra fields appended, without re-encoding the
+        # cached ones
+        parts = [
+            dumps(field) + b":" + dumps(overrides[field])
+            if overrides and field in overrides else fragment
+            for field, fragment in self.fragments.items()
+        ]
+
+        if extra:
+            parts += [dumps(field) + b":" + dumps(value) for field, value in extra.items()]
+
+        return b"{" + b",".join(parts) + b"}"
+
+
+class ResultCache:
+
+    def __init__(self, max_entries=1024, weight_step=0.0, fingerprint=None, check_seconds=1.0):
+
+        self.max_entries = max_entries
+
+        # Weights are snapped to the nearest multiple of weight_step, and
+        # the snapped weight is what gets optimized; 0 keeps them exact.
+        self.weight_step = weight_step
+
+        # fingerprint() summarises the agent parameters; when it changes,
+        # every entry is dropped. Checked at most once per check_seconds.
+        self.fingerprint = fingerprint
+        self.check_seconds = check_seconds
+        self.current = fingerprint() if fingerprint else None
+        self.next_check = time.monotonic() + check_seconds
+
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.memory_bytes = 0
+
+    @classmethod
+    def from_env(cls, fingerprint=None):
+        return cls(
+            max_entries=int(os.getenv("RESULT_CACHE_SIZE", "1024")),
+            weight_step=float(os.getenv("RESULT_CACHE_WEIGHT_STEP", "0")),
+            fingerprint=fingerprint
+        )
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def snap(self, weight):
+
+        if not self.weight_step:
+            return weight
+
+        return round(round(weight / self.weight_step) * self.weight_step, 6)
+
+    def quantize(self, request):
+
+        weight = self.snap(request.cargo_weight)
+
+        if weight == request.cargo_weight:
+            return request
+
+        return RouteRequest(
+            source=request.source,
+            destination=request.destination,
+            cargo_weight=weight,
+            priority=request.priority
+        )
+
+    def make_key(self, request, fields):
+        return (
+            request.source,
+            request.destination,
+            self.snap(request.cargo_weight),
+            request.priority,
+            fields
+        )
+
+    def get(self, key):
+
+        if not self.enabled:
+            return None
+
+        self.check_parameters()
+
+        with self.lock:
+
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, result, reasoning_context=None):
+
+        entry = CachedResult(result, reasoning_context)
+
+        if not self.enabled:
+            return entry
+
+        with self.lock:
+
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.memory_bytes -= previous.size
+
+            self.entries[key] = entry
+            self.memory_bytes += entry.size
+
+            while len(self.entries) > self.max_entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.memory_bytes -= evicted.size
+
+        return entry
+
+    def check_parameters(self):
+
+        if self.fingerprint is None or time.monotonic() < self.next_check:
+            return
+
+        self.next_check = time.monotonic() + self.check_seconds
+        current = self.fingerprint()
+
+        if current != self.current:
+            self.current = current
+            self.invalidate()
+
+    def invalidate(self):
+
+        with self.lock:
+            self.entries.clear()
+            self.memory_bytes = 0
+            self.invalidations += 1
+
+    def stats(self):
+
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "memory_bytes": self.memory_bytes
+            }
@@ -0,0 +1,65 @@
+"""End-to-end optimize latency: agents in a fixed sequence versus the DAG.
+
+Reasoning is replaced by a stub that sleeps like a Bedrock call, and the
+comparison frontier cache is cleared so every request does its full work.
+
+Run from the repository root:
+
+    python -m benchmarks.agent_graph
+"""
+
+import time
+
+from app.agents.models.route_models import RouteRequest
+from app.agents.orchestrator import LogisticsOrchestrator, RESULT_KEYS
+
+
+REASONING_SECONDS = 0.05
+LANES = [("Pune", "Kolkata"), ("Surat", "Bangalore"), ("Delhi", "Chennai"), ("Agra", "Hyderabad")]
+ROUNDS = 10
+
+
+class SlowReasoning:
+
+    def generate_reasoning(self, context_data):
+        time.sleep(REASONING_SECONDS)
+        return "stub reasoning"
+
+
+def mean_ms(orchestrator, executor):
+
+    requests = [
+        RouteRequest(source=source, destination=destination, cargo_weight=420.0, priority="Medium")
+        for source, destination in LANES
+    ]
+    total = 0.0
+
+    for _ in range(ROUNDS):
+        for request in requests:
+
+            orchestrator.comparison_agent._frontiers.clear()
+
+            start = time.perf_counter()
+            orchestrator.graph.run({"request": request}, RESULT_KEYS + ("ai_reasoning",), executor)
+            total += time.perf_counter() - start
+
+    return total / (ROUNDS * len(LANES)) * 1e3
+
+
+def main():
+
+    orchestrator = LogisticsOrchestrator()
+    orchestrator.ai_service = SlowReasoning()
+
+    # Without an executor every node runs inline in declaration order
+    sequential_ms = mean_ms(orchestrator, None)
+    graph_ms = mean_ms(orchestrator, orchestrator.executor)
+
+    print(f"reasoning stub          {REASONING_SECONDS * 1e3:8.2f} ms")
+    print(f"sequential agents       {sequential_ms:8.2f} ms/request")
+    print(f"dependency graph        {graph_ms:8.2f} ms/request")
+    print(f"deterministic work hidden behind reasoning {sequential_ms - graph_ms:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
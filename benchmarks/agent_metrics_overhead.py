@@ -0,0 +1,49 @@
+"""Per-call overhead of the agent latency instrumentation.
+
+Run from the repository root:
+
+    python -m benchmarks.agent_metrics_overhead
+"""
+
+import time
+
+from app.agents.cost_agent import CostAgent
+from app.agents.models.route_models import RouteRequest
+from app.services.agent_metrics import AgentMetrics
+
+
+CALLS = 200_000
+
+
+def per_call_ns(fn):
+
+    start = time.perf_counter_ns()
+    fn()
+    return (time.perf_counter_ns() - start) / CALLS
+
+
+def main():
+
+    agent = CostAgent()
+    metrics = AgentMetrics()
+    request = RouteRequest(source="Mumbai", destination="Delhi", cargo_weight=120, priority="Low")
+
+    def direct():
+        for _ in range(CALLS):
+            agent.calculate(request)
+
+    def instrumented():
+        for _ in range(CALLS):
+            metrics.call("Cost Agent", agent.calculate, request)
+
+    direct_ns = min(per_call_ns(direct) for _ in range(5))
+    instrumented_ns = min(per_call_ns(instrumented) for _ in range(5))
+
+    print(f"direct call        {direct_ns:8.1f} ns")
+    print(f"instrumented call  {instrumented_ns:8.1f} ns")
+    print(f"overhead           {(instrumented_ns - direct_ns) / 1000:8.3f} us per agent call")
+    print(metrics.snapshot())
+
+
+if __name__ == "__main__":
+    main()
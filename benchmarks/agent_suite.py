@@ -0,0 +1,253 @@
+"""Per-agent microbenchmarks with regression thresholds.
+
+Each agent, and LogisticsOrchestrator.optimize with AI reasoning stubbed,
+runs over a seeded mix of requests: known and unknown lanes, light to
+heavy cargo, every priority. For each case the suite records ops/sec,
+p50/p95/p99 latency and the tracemalloc peak of a single call, then
+compares them with the stored baseline. It exits with status 1 when
+throughput drops, p95 latency rises or peak memory grows by more than the
+tolerance.
+
+Baselines depend on the machine; record them again after a deliberate
+change or on new hardware. Run from the repository root:
+
+    python -m benchmarks.agent_suite                 # compare with the baseline
+    python -m benchmarks.agent_suite --update        # record a new baseline
+    python -m benchmarks.agent_suite --only "Cost Agent,Risk Agent"
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.agents.models.route_models import RouteRequest
+from app.agents.orchestrator import LogisticsOrchestrator
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "agent_suite.json")
+
+MIX_SIZE = 512
+CITIES = ["Mumbai", "Delhi", "Chennai", "Pune", "Kolkata", "Surat", "Bangalore", "Hyderabad", "Jaipur", "Agra"]
+UNKNOWN = ["Shillong", "Leh"]
+PRIORITIES = ["Low", "Medium", "High"]
+
+
+class StubReasoning:
+
+    def generate_reasoning(self, context_data):
+        return "stub reasoning"
+
+    async def generate_reasoning_async(self, context_data):
+        return "stub reasoning"
+
+
+def make_mix(size=MIX_SIZE, seed=11):
+
+    # Mostly known lanes, some unknown cities (fallback distance), cargo
+    # from parcels to full loads
+    rng = random.Random(seed)
+    requests = []
+
+    for _ in range(size):
+        cities = CITIES + UNKNOWN if rng.random() < 0.1 else CITIES
+        source, destination = rng.sample(cities, 2)
+        requests.append(RouteRequest(
+            source=source,
+            destination=destination,
+            cargo_weight=round(rng.lognormvariate(5.5, 0.9), 1),
+            priority=rng.choice(PRIORITIES)
+        ))
+
+    return requests
+
+
+def build_cases(orchestrator, requests):
+
+    # name -> (call taking one mix index, calls per timing round)
+    values = [
+        orchestrator.graph.run({"request": request}, ("route", "cost", "carbon", "risk", "sustainability"))
+        for request in requests
+    ]
+    scores = [value["sustainability"]["sustainability_score"] for value in values]
+
+    uncached = LogisticsOrchestrator()
+    uncached.ai_service = StubReasoning()
+    uncached.result_cache.max_entries = 0
+
+    cached = LogisticsOrchestrator()
+    cached.ai_service = StubReasoning()
+
+    o = orchestrator
+
+    def cold_comparison(i):
+        o.comparison_agent._frontiers.clear()
+        o.comparison_agent.generate_alternatives(requests[i])
+
+    return {
+        "Cost Agent": (lambda i: o.cost_agent.calculate(requests[i]), 20_000),
+        "Carbon Agent": (lambda i: o.carbon_agent.calculate(requests[i]), 20_000),
+        "Risk Agent": (lambda i: o.risk_agent.analyze(requests[i]), 20_000),
+        "Sustainability Agent": (
+            lambda i: o.sustainability_agent.evaluate(values[i]["carbon"], requests[i].cargo_weight), 20_000
+        ),
+        "Performance Agent": (
+            lambda i: o.performance_agent.calculate(values[i]["cost"], values[i]["carbon"], scores[i], values[i]["risk"]),
+            20_000
+        ),
+        "Explanation Agent": (
+            lambda i: o.explanation_agent.generate(
+                values[i]["route"], values[i]["cost"], values[i]["carbon"], values[i]["risk"], scores[i]
+            ),
+            20_000
+        ),
+        "Simulation Agent": (lambda i: o.simulation_agent.simulate(requests[i]), 5_000),
+        "Comparison Agent": (lambda i: o.comparison_agent.generate_alternatives(requests[i]), 2_000),
+        "Comparison Agent (cold frontier)": (cold_comparison, 100),
+        "Orchestrator optimize": (lambda i: uncached.optimize(requests[i]), 1_000),
+        "Orchestrator optimize (result cache)": (lambda i: cached.optimize(requests[i]), 5_000)
+    }
+
+
+def measure(call, calls, size, rounds=7):
+
+    # Warm up (caches, lazy imports) first. Throughput is the best of
+    # several untimed loops; percentiles come from a separate pass that
+    # times every call, since the clock itself costs about as much as
+    # the smallest agents.
+    for i in range(min(size, calls)):
+        call(i)
+
+    clock = time.perf_counter_ns
+    best_ns = float("inf")
+
+    for _ in range(rounds):
+        start = clock()
+        for n in range(calls):
+            call(n % size)
+        best_ns = min(best_ns, clock() - start)
+
+    samples = np.empty(calls, dtype=np.int64)
+
+    for n in range(calls):
+        start = clock()
+        call(n % size)
+        samples[n] = clock() - start
+
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) / 1e3
+
+    # Largest single-call allocation peak across the mix
+    peak = 0
+    tracemalloc.start()
+
+    try:
+        for i in range(min(size, calls, 256)):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            call(i)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(calls / best_ns * 1e9, 1),
+        "p50_us": round(float(p50), 2),
+        "p95_us": round(float(p95), 2),
+        "p99_us": round(float(p99), 2),
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+
+def regressions(name, result, baseline, tolerance, memory_tolerance):
+
+    failures = []
+
+    if result["ops_per_sec"] < baseline["ops_per_sec"] * (1 - tolerance):
+        failures.append(f"{name}: {result['ops_per_sec']} ops/s, baseline {baseline['ops_per_sec']}")
+    # Tails are noisier than throughput, so they get twice the slack
+    if result["p95_us"] > baseline["p95_us"] * (1 + 2 * tolerance):
+        failures.append(f"{name}: p95 {result['p95_us']} us, baseline {baseline['p95_us']}")
+
+    # Small peaks move by a few hundred bytes with interpreter details
+    if result["peak_kib"] > baseline["peak_kib"] * (1 + memory_tolerance) + 1:
+        failures.append(f"{name}: peak {result['peak_kib']} KiB, baseline {baseline['peak_kib']}")
+
+    return failures
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="record the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed throughput drop (p95 may rise twice as much)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="allowed peak memory growth")
+    parser.add_argument("--only", help="comma-separated case names")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the calls per round")
+    args = parser.parse_args()
+
+    requests = make_mix()
+    orchestrator = LogisticsOrchestrator()
+    orchestrator.ai_service = StubReasoning()
+    cases = build_cases(orchestrator, requests)
+
+    if args.only:
+        selected = [name.strip() for name in args.only.split(",")]
+        unknown = [name for name in selected if name not in cases]
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(unknown)}")
+        cases = {name: cases[name] for name in selected}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["cases"]
+
+    results = {}
+    failures = []
+
+    print(f"{'case':<38}{'ops/s':>12}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'peak KiB':>10}  vs baseline")
+
+    for name, (call, calls) in cases.items():
+
+        result = results[name] = measure(call, max(1, int(calls * args.scale)), len(requests))
+        previous = baseline.get(name)
+
+        if previous is None:
+            change = "new"
+        else:
+            change = f"{result['ops_per_sec'] / previous['ops_per_sec'] - 1:+.1%} ops/s"
+            if not args.update:
+                failures += regressions(name, result, previous, args.tolerance, args.memory_tolerance)
+
+        print(
+            f"{name:<38}{result['ops_per_sec']:>12}{result['p50_us']:>10}{result['p95_us']:>10}"
+            f"{result['p99_us']:>10}{result['peak_kib']:>10}  {change}"
+        )
+
+    if args.update:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cases": {**baseline, **results}
+            }, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    for failure in failures:
+        print("REGRESSION:", failure)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
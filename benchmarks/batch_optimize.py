@@ -0,0 +1,66 @@
+"""Per-shipment cost of the batch optimizer versus the per-request path.
+
+Run from the repository root:
+
+    python -m benchmarks.batch_optimize
+"""
+
+import random
+import time
+
+from app.agents.models.route_models import RouteRequest
+from app.agents.orchestrator import LogisticsOrchestrator
+
+
+CITIES = ["Mumbai", "Delhi", "Chennai", "Jaipur", "Bangalore", "Hyderabad", "Kolkata"]
+PRIORITIES = ["Low", "Medium", "High"]
+
+
+class NoReasoning:
+
+    def generate_reasoning(self, context_data):
+        return None
+
+
+def make_requests(size, seed=7):
+
+    rng = random.Random(seed)
+
+    return [
+        RouteRequest(
+            source=rng.choice(CITIES),
+            destination=rng.choice(CITIES),
+            cargo_weight=round(rng.uniform(1, 1000), 1),
+            priority=rng.choice(PRIORITIES)
+        )
+        for _ in range(size)
+    ]
+
+
+def per_shipment_us(fn, size):
+
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / size * 1e6
+
+
+def main():
+
+    orchestrator = LogisticsOrchestrator()
+    orchestrator.ai_service = NoReasoning()
+
+    for size in (10_000, 100_000):
+
+        requests = make_requests(size)
+
+        loop_us = per_shipment_us(lambda: [orchestrator.optimize(r) for r in requests], size)
+        batch_us = per_shipment_us(lambda: orchestrator.optimize_batch(requests), size)
+
+        print(
+            f"{size:>7} shipments | per-request {loop_us:7.2f} us/shipment | "
+            f"batch {batch_us:7.2f} us/shipment | speedup {loop_us / batch_us:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Distance-aware cost and carbon versus the old flat per-kg constants.
+
+The flat agents are the cost and carbon agents as they were before lane
+pricing, so each line compares the same calls: per request against per
+request, and the batch path on its own.
+
+Run from the repository root:
+
+    python -m benchmarks.lane_costs
+"""
+
+import random
+import time
+
+from app.agents.batch import RouteBatch
+from app.agents.carbon_agent import CarbonAgent
+from app.agents.cost_agent import CostAgent
+from app.agents.models.route_models import RouteRequest
+
+
+CITIES = ["Mumbai", "Delhi", "Chennai", "Jaipur", "Bangalore", "Hyderabad", "Kolkata"]
+CALLS = 100_000
+ROUNDS = 7
+
+
+class FlatCostAgent:
+
+    def calculate(self, request):
+        base_rate = 2.5
+        return round(request.cargo_weight * base_rate, 2)
+
+
+class FlatCarbonAgent:
+
+    def calculate(self, request):
+        carbon_factor = 0.8
+        return round(request.cargo_weight * carbon_factor, 2)
+
+
+def main():
+
+    rng = random.Random(5)
+    requests = [
+        RouteRequest(
+            source=rng.choice(CITIES),
+            destination=rng.choice(CITIES),
+            cargo_weight=round(rng.uniform(1, 1000), 1),
+            priority="Low"
+        )
+        for _ in range(CALLS)
+    ]
+
+    cost_agent = CostAgent()
+    carbon_agent = CarbonAgent()
+    flat_cost_agent = FlatCostAgent()
+    flat_carbon_agent = FlatCarbonAgent()
+
+    batch = RouteBatch(requests)
+
+    cases = {
+        "flat": lambda: [(flat_cost_agent.calculate(r), flat_carbon_agent.calculate(r)) for r in requests],
+        "lane": lambda: [(cost_agent.calculate(r), carbon_agent.calculate(r)) for r in requests],
+        "batch": lambda: (cost_agent.calculate_batch(batch), carbon_agent.calculate_batch(batch))
+    }
+
+    # Rounds alternate between the cases so machine noise hits them alike;
+    # the best round of each is kept
+    best = dict.fromkeys(cases, float("inf"))
+
+    for _ in range(ROUNDS):
+        for name, fn in cases.items():
+            start = time.perf_counter()
+            fn()
+            best[name] = min(best[name], time.perf_counter() - start)
+
+    flat_ns, lane_ns, batch_ns = (best[name] / CALLS * 1e9 for name in cases)
+
+    print(f"flat per-kg, per request     {flat_ns:8.1f} ns/request")
+    print(f"distance-aware, per request  {lane_ns:8.1f} ns/request  ({lane_ns / flat_ns:.2f}x flat)")
+    print(f"distance-aware, batch        {batch_ns:8.1f} ns/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""End-to-end load test against a local server backed by the fake Bedrock.
+
+Starts uvicorn with BEDROCK_FAKE=1, configured by the --bedrock-* options,
+then drives /optimize-route, /executive-advisory and /autonomous-decision
+at each concurrency level and reports throughput and latency percentiles.
+Payloads come from a seeded generator, so runs are reproducible. --url
+targets a server that is already running instead (its Bedrock settings
+are then its own).
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --concurrency 1,8,32 --requests 400 \\
+        --bedrock-latency 0.3 --bedrock-distribution lognormal --bedrock-error-rate 0.02
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+ENDPOINTS = ("optimize-route", "executive-advisory", "autonomous-decision")
+
+CITIES = ["Mumbai", "Delhi", "Chennai", "Pune", "Kolkata", "Surat", "Bangalore", "Hyderabad", "Jaipur", "Agra"]
+PRIORITIES = ["Low", "Medium", "High"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args):
+
+    port = free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.getcwd(),
+        BEDROCK_FAKE="1",
+        BEDROCK_FAKE_LATENCY_SECONDS=str(args.bedrock_latency),
+        BEDROCK_FAKE_LATENCY_DISTRIBUTION=args.bedrock_distribution,
+        BEDROCK_FAKE_LATENCY_SPREAD=str(args.bedrock_spread),
+        BEDROCK_FAKE_ERROR_RATE=str(args.bedrock_error_rate),
+        BEDROCK_FAKE_TIMEOUT_RATE=str(args.bedrock_timeout_rate),
+        BEDROCK_FAKE_RATE_PER_SECOND=str(args.bedrock_rate),
+        BEDROCK_FAKE_SEED=str(args.seed)
+    )
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 30
+
+    while time.monotonic() < deadline:
+        try:
+            request("GET", url, "/")
+            return server, url
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            time.sleep(0.05)
+
+    server.terminate()
+    raise RuntimeError("server did not start within 30 s")
+
+
+def request(method, url, path, body=None, connection=None):
+
+    # Status and body; reuses connection (keep-alive) when one is given
+    parsed = urllib.parse.urlsplit(url)
+    own = connection is None
+
+    if own:
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+
+    try:
+        connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        if own:
+            connection.close()
+
+
+def make_payloads(endpoint, count, sample, seed):
+
+    # Encoded request bodies. Optimize requests draw lanes and weights;
+    # advisory results vary in cost so the AI cache misses. Each level
+    # gets its own seed so it does not replay the previous level's
+    # (now cached) requests.
+    rng = random.Random(seed)
+    payloads = []
+
+    for i in range(count):
+
+        if endpoint == "optimize-route":
+            source, destination = rng.sample(CITIES, 2)
+            body = {
+                "source": source,
+                "destination": destination,
+                "cargo_weight": float(rng.randrange(50, 2000, 25)),
+                "priority": rng.choice(PRIORITIES)
+            }
+        elif endpoint == "executive-advisory":
+            body = {"result": {**sample, "estimated_cost": round(sample["estimated_cost"] + seed * 1000 + i * 0.01, 2)}}
+        else:
+            body = {"result": {**sample, "overall_performance_index": rng.randint(30, 95)}}
+
+        payloads.append(json.dumps(body).encode("utf-8"))
+
+    return payloads
+
+
+def run_level(url, endpoint, concurrency, payloads):
+
+    # Each worker holds one keep-alive connection and takes the next
+    # payload until none are left
+    latencies = [None] * len(payloads)
+    statuses = [None] * len(payloads)
+    position = iter(range(len(payloads)))
+    lock = threading.Lock()
+    parsed = urllib.parse.urlsplit(url)
+
+    def worker():
+
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+
+        try:
+            while True:
+                with lock:
+                    i = next(position, None)
+                if i is None:
+                    return
+
+                start = time.perf_counter()
+                try:
+                    statuses[i], _ = request("POST", url, f"/{endpoint}", payloads[i], connection)
+                except (OSError, http.client.HTTPException):
+                    statuses[i] = 0
+                    connection.close()
+                    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=60)
+                latencies[i] = time.perf_counter() - start
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1e3
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(payloads),
+        "errors": sum(status != 200 for status in statuses),
+        "throughput_rps": round(len(payloads) / elapsed, 1),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(latencies.max()), 2)
+    }
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="existing server to test instead of starting one")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=400, help="requests per endpoint and level")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--bedrock-latency", type=float, default=0.3, help="median fake Bedrock latency in seconds")
+    parser.add_argument("--bedrock-distribution", default="lognormal", choices=("fixed", "uniform", "lognormal"))
+    parser.add_argument("--bedrock-spread", type=float, default=0.5)
+    parser.add_argument("--bedrock-error-rate", type=float, default=0.0)
+    parser.add_argument("--bedrock-timeout-rate", type=float, default=0.0)
+    parser.add_argument("--bedrock-rate", type=float, default=0.0, help="fake Bedrock calls per second, 0 for no limit")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+
+    if url is None:
+        server, url = start_server(args)
+
+    try:
+        # One real result to build the advisory and decision payloads from
+        status, body = request(
+            "POST", url, "/optimize-route",
+            json.dumps({"source": "Pune", "destination": "Kolkata", "cargo_weight": 420.0, "priority": "Medium"})
+        )
+        if status != 200:
+            raise RuntimeError(f"sample optimize request failed with {status}")
+        sample = json.loads(body)["result"]
+
+        results = []
+
+        print(f"{'endpoint':<22}{'conc':>5}{'reqs':>7}{'errors':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+
+        for endpoint in args.endpoints.split(","):
+            for level, concurrency in enumerate(int(level) for level in args.concurrency.split(",")):
+
+                payloads = make_payloads(endpoint, args.requests, sample, args.seed + level)
+                result = run_level(url, endpoint, concurrency, payloads)
+                results.append(result)
+
+                print(
+                    f"{endpoint:<22}{concurrency:>5}{result['requests']:>7}{result['errors']:>7}"
+                    f"{result['throughput_rps']:>9}{result['p50_ms']:>10}{result['p95_ms']:>10}"
+                    f"{result['p99_ms']:>10}{result['max_ms']:>10}"
+                )
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"settings": vars(args), "results": results}, f, indent=2)
+
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
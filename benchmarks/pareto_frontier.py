@@ -0,0 +1,93 @@
+"""Sweep-based Pareto frontier versus the naive all-pairs filter.
+
+Run from the repository root:
+
+    python -m benchmarks.pareto_frontier
+"""
+
+import time
+
+import numpy as np
+
+from app.agents.comparison_agent import ComparisonAgent
+from app.agents.pareto import pareto_front
+
+
+SIZES = (1_000, 5_000, 20_000)
+LANES = [("Mumbai", "Kolkata"), ("Pune", "Kolkata"), ("Delhi", "Chennai"), ("Surat", "Bangalore")]
+
+
+def naive_front(cost, carbon, hours):
+
+    # Compare every candidate with every other: O(n^2)
+    points = np.column_stack((cost, carbon, hours))
+    front = []
+
+    for i, point in enumerate(points):
+        dominated = np.all(points <= point, axis=1) & np.any(points < point, axis=1)
+        if not dominated.any():
+            front.append(i)
+
+    return front
+
+
+def trade_off_candidates(size, seed=3):
+
+    # Cheaper options are slower and dirtier, like real mode choices
+    rng = np.random.default_rng(seed)
+
+    cost = rng.uniform(1, 10, size)
+    carbon = 10 / cost * rng.uniform(0.8, 1.25, size)
+    hours = 100 / cost * rng.uniform(0.8, 1.25, size)
+
+    return cost, carbon, hours
+
+
+def best_ms(fn, repeat=3):
+
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1e3
+
+
+def main():
+
+    for size in SIZES:
+
+        cost, carbon, hours = trade_off_candidates(size)
+
+        fast = pareto_front(cost, carbon, hours)
+        naive = naive_front(cost, carbon, hours)
+
+        # Exact duplicates are kept by the naive filter, so compare sets
+        points = {(cost[i], carbon[i], hours[i]) for i in naive}
+        assert {(cost[i], carbon[i], hours[i]) for i in fast} == points
+
+        sweep_ms = best_ms(lambda: pareto_front(cost, carbon, hours))
+        naive_ms = best_ms(lambda: naive_front(cost, carbon, hours), repeat=1)
+
+        print(
+            f"{size:>7} candidates | frontier {len(fast):>5} | sweep {sweep_ms:8.2f} ms | "
+            f"all-pairs {naive_ms:9.2f} ms | speedup {naive_ms / sweep_ms:6.1f}x"
+        )
+
+    agent = ComparisonAgent()
+
+    for source, destination in LANES:
+
+        cold_ms = best_ms(lambda: (agent._frontiers.clear(), agent.frontier(source, destination)))
+        frontier = agent.frontier(source, destination)
+
+        print(
+            f"{source} → {destination}: {frontier['candidates']} candidates, "
+            f"{len(frontier['options'])} on the frontier, {cold_ms:.2f} ms uncached"
+        )
+
+
+if __name__ == "__main__":
+    main()
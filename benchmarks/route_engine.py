@@ -0,0 +1,73 @@
+"""Load time and query latency of the route engine on a synthetic lane graph.
+
+Run from the repository root:
+
+    python -m benchmarks.route_engine
+"""
+
+import random
+import time
+
+from app.agents.route_engine import RouteEngine, haversine_km
+
+
+GRID = 70
+HUBS = 50
+QUERIES = 20_000
+
+
+def synthetic_graph(seed=11):
+
+    rng = random.Random(seed)
+
+    # Jittered grid over the Indian subcontinent, lanes to grid neighbours
+    nodes = {
+        f"N{r}_{c}": (8 + r * 0.3 + rng.uniform(-0.1, 0.1), 68 + c * 0.3 + rng.uniform(-0.1, 0.1))
+        for r in range(GRID)
+        for c in range(GRID)
+    }
+
+    edges = []
+    for r in range(GRID):
+        for c in range(GRID):
+            for dr, dc in ((0, 1), (1, 0)):
+                if r + dr < GRID and c + dc < GRID:
+                    a, b = f"N{r}_{c}", f"N{r + dr}_{c + dc}"
+                    edges.append((a, b, haversine_km(*nodes[a], *nodes[b]) * rng.uniform(1.1, 1.4)))
+
+    hubs = rng.sample(list(nodes), HUBS)
+
+    return nodes, edges, hubs
+
+
+def main():
+
+    nodes, edges, hubs = synthetic_graph()
+
+    start = time.perf_counter()
+    engine = RouteEngine(nodes, edges, hubs)
+    load_s = time.perf_counter() - start
+
+    rng = random.Random(3)
+    names = list(nodes)
+
+    hub_pairs = [(rng.choice(hubs), rng.choice(hubs)) for _ in range(QUERIES)]
+    start = time.perf_counter()
+    for source, destination in hub_pairs:
+        engine.shortest_path(source, destination)
+    hub_us = (time.perf_counter() - start) / QUERIES * 1e6
+
+    node_pairs = [(rng.choice(names), rng.choice(names)) for _ in range(200)]
+    start = time.perf_counter()
+    for source, destination in node_pairs:
+        engine.shortest_path(source, destination)
+    astar_ms = (time.perf_counter() - start) / len(node_pairs) * 1e3
+
+    print(f"graph: {len(nodes)} nodes, {len(edges)} lanes, {HUBS} hubs")
+    print(f"load + hub precompute   {load_s * 1e3:9.1f} ms")
+    print(f"hub-to-hub query        {hub_us:9.1f} us (matrix lookup + path walk)")
+    print(f"arbitrary-node query    {astar_ms:9.2f} ms (A*)")
+
+
+if __name__ == "__main__":
+    main()
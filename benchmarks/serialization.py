@@ -0,0 +1,199 @@
+"""Per-response allocation and serialization time for optimize results.
+
+Builds /optimize-route and /optimize-routes bodies the way the endpoints
+do, with AI reasoning stubbed, and reports for each case:
+
+  - the time to serialize the body with the app's encoder (orjson when it
+    is installed) and with FastAPI's default path for a returned dict
+    (jsonable_encoder, then JSONResponse), with the tracemalloc peak of each;
+  - the tracemalloc peak of producing the result, and for batches the
+    bytes per row it keeps alive, next to the same rows with the slotted
+    result objects turned back into dicts.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 100,1000,10000 --json serialization.json
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import sys
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.agents.orchestrator import LogisticsOrchestrator
+from app.services import json_response
+from app.services.json_response import FastJSONResponse
+from benchmarks.agent_suite import StubReasoning, make_mix
+
+
+def best_ms(call, rounds):
+
+    best = float("inf")
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+
+    return round(best * 1e3, 3)
+
+
+def peak_kib(call):
+
+    tracemalloc.start()
+
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        call()
+        return round((tracemalloc.get_traced_memory()[1] - baseline) / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def retained_bytes(value, seen=None):
+
+    # Deep size counting each object once, so shared strings count once
+    seen = set() if seen is None else seen
+
+    if id(value) in seen:
+        return 0
+
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += retained_bytes(key, seen) + retained_bytes(item, seen)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += retained_bytes(item, seen)
+    elif dataclasses.is_dataclass(value):
+        for field in dataclasses.fields(value):
+            size += retained_bytes(getattr(value, field.name), seen)
+
+    return size
+
+
+def as_dicts(value):
+
+    # Nested entries as dicts, sharing the same values
+    if isinstance(value, dict):
+        return {key: as_dicts(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [as_dicts(item) for item in value]
+    if dataclasses.is_dataclass(value):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+
+    return value
+
+
+def serialization(content, rounds):
+    return {
+        "app_ms": best_ms(lambda: FastJSONResponse(content), rounds),
+        "fastapi_default_ms": best_ms(lambda: JSONResponse(jsonable_encoder(content)), rounds),
+        "app_peak_kib": peak_kib(lambda: FastJSONResponse(content)),
+        "fastapi_default_peak_kib": peak_kib(lambda: JSONResponse(jsonable_encoder(content)))
+    }
+
+
+def single_cases(rounds):
+
+    # One /optimize-route body: a miss runs the agents and encodes every
+    # field, a hit splices the cached fragments around fresh reasoning
+    request = make_mix(1)[0]
+    loop = asyncio.new_event_loop()
+
+    uncached = LogisticsOrchestrator()
+    uncached.ai_service = StubReasoning()
+    uncached.result_cache.max_entries = 0
+
+    cached = LogisticsOrchestrator()
+    cached.ai_service = StubReasoning()
+
+    def respond(orchestrator):
+        return loop.run_until_complete(orchestrator.optimize_json(request))
+
+    respond(uncached)
+    respond(cached)
+
+    cases = {}
+
+    for name, orchestrator in (("optimize-route (miss)", uncached), ("optimize-route (hit)", cached)):
+        cases[name] = {
+            "response_ms": best_ms(lambda: respond(orchestrator), rounds * 20),
+            "response_peak_kib": peak_kib(lambda: respond(orchestrator)),
+            **serialization({"result": uncached.optimize(request)}, rounds * 20)
+        }
+
+    loop.close()
+
+    return cases
+
+
+def batch_cases(sizes, rounds):
+
+    orchestrator = LogisticsOrchestrator()
+    orchestrator.ai_service = StubReasoning()
+    requests = make_mix(max(sizes), seed=5)
+    cases = {}
+
+    for size in sizes:
+
+        batch = requests[:size]
+        orchestrator.optimize_batch(batch)
+        rows = orchestrator.optimize_batch(batch)
+
+        cases[f"optimize-routes x{size}"] = {
+            "build_ms": best_ms(lambda: orchestrator.optimize_batch(batch), rounds),
+            "build_peak_kib": peak_kib(lambda: orchestrator.optimize_batch(batch)),
+            "retained_bytes_per_row": round(retained_bytes(rows) / size),
+            "dict_layout_bytes_per_row": round(retained_bytes(as_dicts(rows)) / size),
+            **serialization({"results": rows}, rounds)
+        }
+
+    return cases
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="100,1000", help="comma-separated batch sizes")
+    parser.add_argument("--rounds", type=int, default=5, help="timing rounds per case (best is kept)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.rows.split(",")]
+
+    results = {**single_cases(args.rounds), **batch_cases(sizes, args.rounds)}
+
+    print(f"encoder: {'orjson' if json_response.orjson is not None else 'json (orjson not installed)'}")
+    print(
+        f"{'case':<24}{'encode ms':>11}{'default ms':>12}{'speedup':>9}"
+        f"{'encode KiB':>12}{'default KiB':>13}{'build KiB':>11}{'B/row':>8}{'dict B/row':>12}"
+    )
+
+    for name, result in results.items():
+
+        build_kib = result.get("build_peak_kib", result.get("response_peak_kib"))
+
+        print(
+            f"{name:<24}{result['app_ms']:>11}{result['fastapi_default_ms']:>12}"
+            f"{result['fastapi_default_ms'] / result['app_ms']:>8.1f}x"
+            f"{result['app_peak_kib']:>12}{result['fastapi_default_peak_kib']:>13}{build_kib:>11}"
+            f"{result.get('retained_bytes_per_row', '-'):>8}{result.get('dict_layout_bytes_per_row', '-'):>12}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
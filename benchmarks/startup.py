@@ -0,0 +1,144 @@
+"""Cold start: import time of app.main and time to the first response.
+
+Every measurement runs in a fresh interpreter. Time to first response
+starts a uvicorn worker and polls a deterministic /optimize-route request
+(no ai_reasoning) until it is answered. Both run the default
+configuration with the application lifespan, so startup hooks such as
+Bedrock warm-up count. The in-process run then checks that boto3 was
+never imported.
+
+Exits with status 1 when the median of either measurement is over its
+budget or boto3 was imported. Run from the repository root:
+
+    python -m benchmarks.startup [--import-budget 1.0] [--first-response-budget 1.5]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+RUNS = 5
+
+REQUEST = {"source": "Pune", "destination": "Kolkata", "cargo_weight": 420.0, "priority": "Medium"}
+FIELDS = "optimized_route,estimated_cost,carbon_impact,risk_level,alternative_routes"
+
+# Imports app.main, runs the lifespan and serves one request in-process;
+# prints the import time and whether anything pulled in boto3. Startup
+# threads get a moment to run before the check.
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    response = client.post("/optimize-route?fields={FIELDS}", json={REQUEST!r})
+    assert response.status_code == 200, response.text
+    time.sleep(0.5)
+print(json.dumps({{"seconds": elapsed, "boto3": "boto3" in sys.modules}}))
+"""
+
+
+def environment():
+
+    # Default Bedrock configuration: no fake client, no warm-up override
+    env = {name: value for name, value in os.environ.items() if not name.startswith("BEDROCK_")}
+    env["PYTHONPATH"] = os.getcwd()
+
+    return env
+
+
+def measure_import():
+
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        env=environment(), capture_output=True, text=True, check=True
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(timeout=30.0):
+
+    port = free_port()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/optimize-route?fields={FIELDS}",
+        data=json.dumps(REQUEST).encode("utf-8"),
+        headers={"Content-Type": "application/json"}
+    )
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=environment(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                    return time.perf_counter() - start
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before answering")
+                time.sleep(0.01)
+
+        raise RuntimeError(f"no response within {timeout} s")
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--import-budget", type=float, default=1.0, help="seconds for import app.main")
+    parser.add_argument("--first-response-budget", type=float, default=1.5, help="seconds from process start to first response")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    import_seconds = statistics.median(run["seconds"] for run in imports)
+    boto3_loaded = any(run["boto3"] for run in imports)
+
+    first_response_seconds = statistics.median(measure_first_response() for _ in range(args.runs))
+
+    failures = []
+
+    if import_seconds > args.import_budget:
+        failures.append(f"import time {import_seconds:.3f} s is over the {args.import_budget:.3f} s budget")
+    if first_response_seconds > args.first_response_budget:
+        failures.append(
+            f"time to first response {first_response_seconds:.3f} s is over the "
+            f"{args.first_response_budget:.3f} s budget"
+        )
+    if boto3_loaded:
+        failures.append("boto3 was imported before any AI request")
+
+    print(f"import app.main           {import_seconds * 1e3:8.1f} ms  (budget {args.import_budget * 1e3:.0f} ms)")
+    print(f"time to first response    {first_response_seconds * 1e3:8.1f} ms  (budget {args.first_response_budget * 1e3:.0f} ms)")
+    print(f"boto3 imported            {'yes' if boto3_loaded else 'no'}")
+
+    for failure in failures:
+        print("FAIL:", failure)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
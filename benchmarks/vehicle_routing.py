@@ -0,0 +1,55 @@
+"""Solve time and tour quality of the CVRP solver at 50, 200 and 1000 stops.
+
+Run from the repository root:
+
+    python -m benchmarks.vehicle_routing
+"""
+
+import time
+
+import numpy as np
+
+from app.agents.vrp_solver import route_length, savings_routes, nearest_neighbours, solve_cvrp
+
+
+def random_instance(stops, seed):
+
+    rng = np.random.default_rng(seed)
+
+    # Depot in the middle of a 1000 x 1000 km square
+    points = np.vstack([[500.0, 500.0], rng.uniform(0, 1000, size=(stops, 2))])
+    distance = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+
+    demands = [0.0] + rng.integers(50, 500, size=stops).astype(float).tolist()
+
+    return distance, demands
+
+
+def main():
+
+    capacity = 2000.0
+
+    for stops in (50, 200, 1000):
+
+        distance, demands = random_instance(stops, seed=stops)
+        d = distance.tolist()
+
+        start = time.perf_counter()
+        initial = savings_routes(distance, demands, capacity, nearest_neighbours(distance, min(30, stops - 1)))
+        savings_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        routes = solve_cvrp(distance, demands, capacity, time_budget=0.5)
+        solve_ms = (time.perf_counter() - start) * 1000
+
+        initial_km = sum(route_length(r, d) for r in initial)
+        final_km = sum(route_length(r, d) for r in routes)
+
+        print(
+            f"{stops:>5} stops | savings {savings_ms:7.1f} ms, {initial_km:9.0f} km | "
+            f"with local search {solve_ms:7.1f} ms, {final_km:9.0f} km, {len(routes)} tours"
+        )
+
+
+if __name__ == "__main__":
+    main()
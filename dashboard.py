@@ -1,14 +1,29 @@
+import os
+import threading
+import time
+
 import folium
 from streamlit_folium import st_folium
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import plotly.graph_objects as go
 
 # =========================
 # CONFIG
 # =========================
 
-API_BASE = "https://ecosmart-api.onrender.com"
+API_BASE = os.getenv("ECOSMART_API_BASE", "https://ecosmart-api.onrender.com")
+
+# Connect and read timeouts in seconds; the advisory waits on Nova
+API_TIMEOUT = (3.05, 20)
+ADVISORY_TIMEOUT = (3.05, 60)
+
+# Seconds an optimization or advisory for the same inputs is reused
+RESULT_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "600"))
+
+# Seconds between background /agent-status polls
+AGENT_STATUS_INTERVAL = int(os.getenv("DASHBOARD_STATUS_INTERVAL_SECONDS", "10"))
 
 CITY_COORDS = {
     "Mumbai": (19.0760, 72.8777),
@@ -20,6 +35,163 @@ CITY_COORDS = {
     "Kolkata": (22.5726, 88.3639)
 }
 
+# =========================
+# API CLIENT
+# =========================
+
+@st.cache_resource
+def get_session():
+
+    # One keep-alive connection pool for every rerun and every viewer;
+    # connection errors are retried, requests that reached the API are not
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+@st.cache_data(ttl=RESULT_CACHE_TTL, show_spinner="Optimizing route...")
+def optimize_route(source, destination, cargo_weight, priority):
+
+    # Errors raise, so only successful results are cached
+    response = get_session().post(
+        f"{API_BASE}/optimize-route",
+        json={
+            "source": source,
+            "destination": destination,
+            "cargo_weight": cargo_weight,
+            "priority": priority
+        },
+        timeout=API_TIMEOUT
+    )
+    response.raise_for_status()
+
+    return response.json()["result"]
+
+
+@st.cache_data(ttl=RESULT_CACHE_TTL, show_spinner="Asking Amazon Nova...")
+def executive_advisory(result):
+
+    response = get_session().post(
+        f"{API_BASE}/executive-advisory",
+        json={"result": result},
+        timeout=ADVISORY_TIMEOUT
+    )
+    response.raise_for_status()
+
+    return response.json()["executive_advisory"]
+
+
+class AgentStatusPoller:
+
+    # Fetches /agent-status on a daemon thread; reruns read the latest
+    # snapshot instead of calling the API themselves. The first fetch is
+    # made here so the first page view already has one.
+    def __init__(self, session, interval):
+
+        self.session = session
+        self.interval = interval
+        self.latest = None
+        self.updated_at = None
+
+        self.poll()
+
+        threading.Thread(target=self.run, name="agent-status-poller", daemon=True).start()
+
+    def run(self):
+
+        while True:
+            time.sleep(self.interval)
+            self.poll()
+
+    def poll(self):
+
+        try:
+            response = self.session.get(f"{API_BASE}/agent-status", timeout=API_TIMEOUT)
+            response.raise_for_status()
+            self.latest = response.json()
+            self.updated_at = time.time()
+        except (requests.RequestException, ValueError):
+            pass
+
+
+@st.cache_resource
+def get_status_poller():
+    # One poller per server process, shared by all viewers
+    return AgentStatusPoller(get_session(), AGENT_STATUS_INTERVAL)
+
+# =========================
+# FIGURES
+# =========================
+
+# Built once per distinct input and shared; Streamlit only reads them
+
+@st.cache_resource(max_entries=256)
+def gauge_figure(value, title, bar_color, steps):
+
+    figure = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=value,
+        title={'text': title},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': bar_color},
+            'steps': [{'range': [low, high], 'color': color} for low, high, color in steps]
+        }
+    ))
+
+    figure.update_layout(height=350)
+
+    return figure
+
+
+@st.cache_resource(max_entries=256)
+def radar_figure(performance, sustainability, carbon_eff, risk_score):
+
+    radar = go.Figure()
+
+    radar.add_trace(go.Scatterpolar(
+        r=[
+            performance,
+            sustainability,
+            carbon_eff,
+            risk_score
+        ],
+        theta=[
+            "Performance",
+            "Sustainability",
+            "Carbon Efficiency",
+            "Risk Stability"
+        ],
+        fill='toself'
+    ))
+
+    radar.update_layout(height=500)
+
+    return radar
+
+
+@st.cache_resource(max_entries=64)
+def route_map(source, destination):
+
+    source_coords = CITY_COORDS[source]
+    dest_coords = CITY_COORDS[destination]
+
+    m = folium.Map(location=source_coords, zoom_start=5)
+
+    folium.Marker(source_coords, icon=folium.Icon(color="green")).add_to(m)
+    folium.Marker(dest_coords, icon=folium.Icon(color="red")).add_to(m)
+
+    folium.PolyLine(
+        [source_coords, dest_coords],
+        color="blue",
+        weight=4
+    ).add_to(m)
+
+    return m
+
 # =========================
 # PAGE CONFIG
 # =========================
@@ -42,6 +214,9 @@ if "result" not in st.session_state:
 if "advisory" not in st.session_state:
     st.session_state.advisory = None
 
+if "lane" not in st.session_state:
+    st.session_state.lane = None
+
 # =========================
 # INPUT FORM
 # =========================
@@ -66,29 +241,16 @@ with st.form("route_form"):
 
 if submitted:
 
-    payload = {
-        "source": source,
-        "destination": destination,
-        "cargo_weight": cargo_weight,
-        "priority": priority
-    }
-
     try:
 
-        response = requests.post(
-            f"{API_BASE}/optimize-route",
-            json=payload
-        )
-
-        if response.status_code == 200:
+        st.session_state.result = optimize_route(source, destination, cargo_weight, priority)
+        st.session_state.lane = (source, destination)
+        st.session_state.advisory = None
 
-            st.session_state.result = response.json()["result"]
-            st.session_state.advisory = None
+    except requests.HTTPError:
+        st.error("API Error")
 
-        else:
-            st.error("API Error")
-
-    except:
+    except (requests.RequestException, ValueError):
         st.error("Backend not reachable")
 
 # =========================
@@ -123,22 +285,10 @@ if st.session_state.result:
 
     with col1:
 
-        sustainability_fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=result["sustainability_score"],
-            title={'text': "Sustainability Score"},
-            gauge={
-                'axis': {'range': [0, 100]},
-                'bar': {'color': "green"},
-                'steps': [
-                    {'range': [0, 40], 'color': "red"},
-                    {'range': [40, 70], 'color': "yellow"},
-                    {'range': [70, 100], 'color': "green"}
-                ]
-            }
-        ))
-
-        sustainability_fig.update_layout(height=350)
+        sustainability_fig = gauge_figure(
+            result["sustainability_score"], "Sustainability Score", "green",
+            ((0, 40, "red"), (40, 70, "yellow"), (70, 100, "green"))
+        )
 
         st.plotly_chart(sustainability_fig, use_container_width=True)
 
@@ -146,22 +296,10 @@ if st.session_state.result:
 
         confidence = result.get("optimization_confidence_score", 72)
 
-        confidence_fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=confidence,
-            title={'text': "Optimization Confidence"},
-            gauge={
-                'axis': {'range': [0, 100]},
-                'bar': {'color': "#00FFA3"},
-                'steps': [
-                    {'range': [0, 50], 'color': "#FF4B4B"},
-                    {'range': [50, 75], 'color': "#FFA500"},
-                    {'range': [75, 100], 'color': "#00FFA3"}
-                ]
-            }
-        ))
-
-        confidence_fig.update_layout(height=350)
+        confidence_fig = gauge_figure(
+            confidence, "Optimization Confidence", "#00FFA3",
+            ((0, 50, "#FF4B4B"), (50, 75, "#FFA500"), (75, 100, "#00FFA3"))
+        )
 
         st.plotly_chart(confidence_fig, use_container_width=True)
 
@@ -209,25 +347,9 @@ if st.session_state.result:
 
     carbon_eff = max(0, 100 - result["carbon_impact"] / 3)
 
-    radar = go.Figure()
-
-    radar.add_trace(go.Scatterpolar(
-        r=[
-            result["overall_performance_index"],
-            result["sustainability_score"],
-            carbon_eff,
-            risk_score
-        ],
-        theta=[
-            "Performance",
-            "Sustainability",
-            "Carbon Efficiency",
-            "Risk Stability"
-        ],
-        fill='toself'
-    ))
-
-    radar.update_layout(height=500)
+    radar = radar_figure(
+        result["overall_performance_index"], result["sustainability_score"], carbon_eff, risk_score
+    )
 
     st.plotly_chart(radar, use_container_width=True)
 
@@ -239,21 +361,9 @@ if st.session_state.result:
 
     st.subheader("Live Route Visualization")
 
-    source_coords = CITY_COORDS[source]
-    dest_coords = CITY_COORDS[destination]
-
-    m = folium.Map(location=source_coords, zoom_start=5)
-
-    folium.Marker(source_coords, icon=folium.Icon(color="green")).add_to(m)
-    folium.Marker(dest_coords, icon=folium.Icon(color="red")).add_to(m)
-
-    folium.PolyLine(
-        [source_coords, dest_coords],
-        color="blue",
-        weight=4
-    ).add_to(m)
-
-    st_folium(m, width=900)
+    # The lane of the shown result, not whatever the form holds now.
+    # Nothing is returned from the map, so panning does not rerun the page.
+    st_folium(route_map(*st.session_state.lane), width=900, key="route_map", returned_objects=[])
 
     st.divider()
 
@@ -263,14 +373,10 @@ if st.session_state.result:
 
     if st.button("Generate Executive Advisory (Amazon Nova)"):
 
-        response = requests.post(
-            f"{API_BASE}/executive-advisory",
-            json={"result": result}
-        )
-
-        if response.status_code == 200:
-
-            st.session_state.advisory = response.json()["executive_advisory"]
+        try:
+            st.session_state.advisory = executive_advisory(result)
+        except (requests.RequestException, ValueError):
+            st.error("Executive advisory unavailable")
 
     if st.session_state.advisory:
 
@@ -294,26 +400,31 @@ st.divider()
 
 st.subheader("Live AI Agent Monitor")
 
-try:
 
-    status_response = requests.get(f"{API_BASE}/agent-status")
+# Redrawn on its own every interval from the poller's latest snapshot
+@st.fragment(run_every=AGENT_STATUS_INTERVAL)
+def agent_monitor():
+
+    poller = get_status_poller()
+    data = poller.latest
 
-    if status_response.status_code == 200:
+    if data is None:
+        st.warning("Agent monitor unavailable")
+        return
 
-        data = status_response.json()
+    st.success(f"System Status: {data['system_status']}")
 
-        st.success(f"System Status: {data['system_status']}")
+    st.metric("Total Latency", f"{data['total_latency']} ms")
 
-        st.metric("Total Latency", f"{data['total_latency']} ms")
+    for agent in data["agents"]:
 
-        for agent in data["agents"]:
+        col1, col2, col3 = st.columns(3)
 
-            col1, col2, col3 = st.columns(3)
+        col1.write(agent["agent"])
+        col2.write(agent["status"])
+        col3.write(f"{agent['success_rate']}% · p95 {agent['p95_ms']} ms")
 
-            col1.write(agent["agent"])
-            col2.write(agent["status"])
-            col3.write(f"{agent['confidence']}%")
+    st.caption(f"Updated {time.time() - poller.updated_at:.0f} s ago")
 
-except:
 
-    st.warning("Agent monitor unavailable")
+agent_monitor()
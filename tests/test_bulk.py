@@ -0,0 +1,99 @@
+import csv
+import json
+
+import pytest
+
+from app import bulk
+
+
+class FlakyReasoning:
+
+    # Every other call fails, as Bedrock errors would
+    def __init__(self):
+        self.calls = 0
+
+    def generate_reasoning(self, context):
+        self.calls += 1
+        return "Reasoning." if self.calls % 2 else None
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join((row if isinstance(row, str) else json.dumps(row)) + "\n" for row in rows))
+
+
+ROWS = [
+    {"source": "Mumbai", "destination": "Delhi", "cargo_weight": 120, "priority": "Low"},
+    {"source": "Pune", "destination": "Kolkata", "cargo_weight": 480, "priority": "High"},
+    "{not json",
+    [1, 2],
+    {"source": 5, "destination": "Delhi", "cargo_weight": "heavy", "priority": "Low"},
+    {"source": "Chennai", "destination": "Jaipur", "cargo_weight": 75, "priority": "Medium"}
+]
+
+
+@pytest.fixture
+def flaky_reasoning(monkeypatch):
+
+    original = bulk.init_worker
+
+    def init_worker(include_reasoning):
+        original(include_reasoning)
+        bulk.worker_orchestrator._ai_service = FlakyReasoning()
+
+    monkeypatch.setattr(bulk, "init_worker", init_worker)
+
+
+def run_bulk(tmp_path, output_name, *options):
+
+    source = tmp_path / "in.jsonl"
+    write_jsonl(source, ROWS)
+    output = tmp_path / output_name
+
+    bulk.main([str(source), str(output), "--workers", "1", "--chunk-size", "4", "--progress", "0", *options])
+
+    return output
+
+
+def test_csv_rows_match_the_header_when_reasoning_fails_on_some(tmp_path, flaky_reasoning):
+
+    output = run_bulk(tmp_path, "out.csv", "--with-reasoning", "--fields", "estimated_cost,ai_reasoning")
+
+    with open(output, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = list(reader)
+
+    assert header == [
+        "source", "destination", "cargo_weight", "priority", "estimated_cost", "ai_reasoning",
+        "degraded", "degraded_fields", "error"
+    ]
+    assert len(rows) == len(ROWS)
+    assert all(len(row) == len(header) for row in rows)
+
+    degraded = [row[header.index("degraded")] for row in rows]
+    assert "True" in degraded and "False" in degraded
+
+
+def test_parquet_output_keeps_one_schema(tmp_path, flaky_reasoning):
+
+    parquet = pytest.importorskip("pyarrow.parquet")
+
+    output = run_bulk(tmp_path, "out.parquet", "--with-reasoning", "--fields", "estimated_cost,ai_reasoning")
+    table = parquet.read_table(output).to_pydict()
+
+    assert len(table["error"]) == len(ROWS)
+    assert table["source"][4] == "5"
+    assert table["cargo_weight"][4] is None
+    assert [error is None for error in table["error"]] == [True, True, False, False, False, True]
+
+
+def test_unreadable_lines_become_error_records(tmp_path):
+
+    output = run_bulk(tmp_path, "out.jsonl", "--fields", "estimated_cost")
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+
+    assert len(records) == len(ROWS)
+    assert "line 3 is not valid JSON" in records[2]["error"]
+    assert records[3]["error"] == "invalid row: expected a JSON object"
+    assert records[0]["error"] is None and records[0]["estimated_cost"] > 0
+    assert records[5]["error"] is None
@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+from app.services.autonomous_decision_engine import AutonomousDecisionEngine
+
+
+RESULT = {"overall_performance_index": 90, "sustainability_score": 80, "risk_level": "Low"}
+
+
+def decide(lines, chunk_size=7):
+
+    # Feeds the body in small chunks, so lines arrive split across them
+    body = "".join(line + "\n" for line in lines).encode("utf-8")
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def collect():
+        return b"".join([output async for output in AutonomousDecisionEngine().stream_decisions(chunks())])
+
+    return [json.loads(line) for line in asyncio.run(collect()).splitlines()]
+
+
+def test_bad_lines_get_their_own_error_and_the_stream_carries_on():
+
+    lines = [
+        json.dumps({"id": 1, "result": RESULT}),
+        "{not json",
+        "[1, 2]",
+        json.dumps({"id": 4, "result": {**RESULT, "sustainability_score": "high"}}),
+        '{"id": 5, "overall_performance_index": 1' + "0" * 400 + ', "sustainability_score": 80, "risk_level": "Low"}',
+        json.dumps({"id": 6, "result": {"sustainability_score": 80, "risk_level": "Low"}}),
+        json.dumps(RESULT)
+    ]
+
+    output = decide(lines)
+
+    assert len(output) == len(lines)
+    assert output[0] == {"id": 1, **AutonomousDecisionEngine().evaluate(RESULT)}
+    assert all("error" in line for line in output[1:6])
+    assert [line.get("id") for line in output[3:6]] == [4, 5, 6]
+    assert output[6] == AutonomousDecisionEngine().evaluate(RESULT)
+
+
+def test_stream_matches_single_evaluation():
+
+    results = [
+        {"overall_performance_index": p, "sustainability_score": s, "risk_level": r, "optimization_confidence_score": c}
+        for p, s, r, c in [(95, 90, "Low", 80), (70, 55, "Medium", 60), (30, 20, "Elevated", 50), (61, 60, "Low", 59)]
+    ]
+
+    engine = AutonomousDecisionEngine()
+
+    assert decide([json.dumps(result) for result in results]) == [engine.evaluate(result) for result in results]
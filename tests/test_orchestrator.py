@@ -0,0 +1,93 @@
+import random
+import time
+
+from app.agents.models.route_models import RouteRequest
+from app.agents.orchestrator import ALL_FIELDS, LogisticsOrchestrator
+
+
+CITIES = ["Mumbai", "Delhi", "Chennai", "Pune", "Nagpur", "Kolkata", "Atlantis"]
+DETERMINISTIC_FIELDS = [field for field in ALL_FIELDS if field != "ai_reasoning"]
+
+
+class SlowReasoning:
+
+    # Heavy shipments take longer than the test deadline
+    def generate_reasoning(self, context):
+        time.sleep(0.05 if context["cost"] < 1000 else 1.0)
+        return "Reasoning."
+
+
+def make_requests(size, seed=3):
+
+    rng = random.Random(seed)
+
+    return [
+        RouteRequest(
+            source=rng.choice(CITIES),
+            destination=rng.choice(CITIES),
+            cargo_weight=round(rng.uniform(1, 900), 1),
+            priority=rng.choice(["Low", "Medium", "High"])
+        )
+        for _ in range(size)
+    ]
+
+
+def test_batch_matches_per_request_results():
+
+    orchestrator = LogisticsOrchestrator()
+    requests = make_requests(200)
+
+    rows = orchestrator.optimize_batch(requests, fields=DETERMINISTIC_FIELDS)
+
+    assert rows == [orchestrator.optimize(request, fields=DETERMINISTIC_FIELDS) for request in requests]
+
+
+def test_batch_returns_one_result_per_request_with_no_fields():
+
+    orchestrator = LogisticsOrchestrator()
+    requests = make_requests(3)
+
+    assert orchestrator.optimize_batch(requests, fields=[]) == [{}, {}, {}]
+    assert orchestrator.optimize(requests[0], fields=[]) == {}
+
+
+def test_batch_reasoning_past_the_deadline_is_marked_degraded():
+
+    orchestrator = LogisticsOrchestrator()
+    orchestrator._ai_service = SlowReasoning()
+    orchestrator.deadline_seconds = 0.5
+
+    requests = [
+        RouteRequest(source="Mumbai", destination="Pune", cargo_weight=20, priority="Low"),
+        RouteRequest(source="Mumbai", destination="Kolkata", cargo_weight=800, priority="High")
+    ]
+
+    start = time.monotonic()
+    light, heavy = orchestrator.optimize_batch(requests, fields=["estimated_cost", "ai_reasoning"])
+
+    assert time.monotonic() - start < 0.9
+    assert light["ai_reasoning"] == "Reasoning." and "degraded" not in light
+    assert heavy["degraded"] is True and heavy["degraded_fields"] == ["ai_reasoning"]
+
+
+def test_result_cache_survives_the_first_parameter_check():
+
+    orchestrator = LogisticsOrchestrator()
+    orchestrator.result_cache.check_seconds = 0
+    request = make_requests(1)[0]
+
+    orchestrator.optimize(request, fields=DETERMINISTIC_FIELDS)
+    orchestrator.optimize(request, fields=DETERMINISTIC_FIELDS)
+
+    stats = orchestrator.result_cache.stats()
+    assert stats["invalidations"] == 0 and stats["hits"] == 1
+
+
+def test_same_city_lane_reports_the_priced_distance():
+
+    result = LogisticsOrchestrator().optimize(
+        RouteRequest(source="Mumbai", destination="Mumbai", cargo_weight=100, priority="Low"),
+        fields=["route_distance_km", "estimated_cost"]
+    )
+
+    assert result == {"route_distance_km": 50.0, "estimated_cost": 12.5}
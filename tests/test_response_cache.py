@@ -0,0 +1,40 @@
+import sqlite3
+import time
+
+from app.services.response_cache import ResponseCache
+
+
+def stored_values(path):
+    with sqlite3.connect(path) as db:
+        return sorted(row[0] for row in db.execute("SELECT value FROM response_cache"))
+
+
+def test_disk_table_is_bounded_per_namespace(tmp_path):
+
+    path = str(tmp_path / "cache.db")
+    advisories = ResponseCache("executive-advisory", max_entries=3, path=path)
+    reasoning = ResponseCache("nova-reasoning", max_entries=2, ttl_seconds=0.1, path=path)
+
+    for i in range(6):
+        advisories.set({"i": i}, f"advisory {i}")
+    for i in range(3):
+        reasoning.set({"i": i}, f"reasoning {i}")
+
+    assert stored_values(path) == ["advisory 3", "advisory 4", "advisory 5", "reasoning 1", "reasoning 2"]
+
+    # Expired rows go on the next write
+    time.sleep(0.15)
+    reasoning.set({"i": 9}, "reasoning 9")
+
+    assert stored_values(path) == ["advisory 3", "advisory 4", "advisory 5", "reasoning 9"]
+
+
+def test_entries_survive_a_restart(tmp_path):
+
+    path = str(tmp_path / "cache.db")
+    ResponseCache("nova-reasoning", path=path).set({"route": "A"}, "Because.")
+
+    restarted = ResponseCache("nova-reasoning", path=path)
+
+    assert restarted.get({"route": "A"}) == "Because."
+    assert restarted.get({"route": "B"}) is None
@@ -0,0 +1,32 @@
+from app.agents.models.route_models import RouteRequest
+from app.agents.orchestrator import LogisticsOrchestrator
+
+
+DESTINATIONS = ["Pune", "Delhi", "Chennai", "Kolkata", "Pune", "Bengaluru", "Ahmedabad", "Jaipur"]
+
+
+def shipments(weight=100.0):
+    return [
+        RouteRequest(source="Mumbai", destination=city, cargo_weight=weight, priority="Medium")
+        for city in DESTINATIONS
+    ]
+
+
+def test_mixed_fleet_uses_every_vehicle_before_leaving_shipments():
+
+    plan = LogisticsOrchestrator().consolidate(shipments(), [500, 100, 100, 100], time_budget=0.2)
+
+    assert plan["unassigned_shipments"] == []
+    assert sorted(tour["vehicle"] for tour in plan["tours"]) == [0, 1, 2, 3]
+    assert sorted(i for tour in plan["tours"] for i in tour["shipments"]) == list(range(len(DESTINATIONS)))
+
+    for tour in plan["tours"]:
+        assert tour["load_kg"] <= tour["vehicle_capacity"]
+
+
+def test_shipments_left_over_only_when_the_fleet_is_full():
+
+    plan = LogisticsOrchestrator().consolidate(shipments(), [300, 100], time_budget=0.2)
+
+    assert len(plan["unassigned_shipments"]) == 4
+    assert [tour["load_kg"] for tour in plan["tours"]] == [300.0, 100.0]